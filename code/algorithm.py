@@ -1,20 +1,54 @@
-from collections.abc import Iterable, Iterator
-from typing import final
+from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
+from time import perf_counter
+from typing import Optional, Union, final, overload
 
-from common import TWOPI, deg, rad
+import numpy as np
+
+from common import Real, TWOPI, deg, mix64, mix64s, rad, reduce_angles
 from cyclic import CyclicList
-from geometry.point import PointBase
-from geometry.sector import MutableSector, SectorBase
+from geometry.circle import CircleBase, FixedCircle
+from geometry.grid import PointGrid
+from geometry.point import PointArray, PointBase, PointView, arctan2, point_columns, relative_polar, weights_column
+from geometry.sector import FixedSector, MutableSector, SectorBase, check_arc
+from instrumentation import Instrumentation, Step, Timer
+from sweep import (alias_angles, align_windows, check_tolerance, compensated_sums, range_sums, sweep_events,
+                   sweep_limits, sweep_windows)
 from views import ListView
 
 
+def point_key(p: PointBase, /) -> int:
+    """
+    Returns the key of the point for fingerprints of groups, keys depend on identities of points.
+    A point of a PointArray is identified by the array and its index, all views of the point have the same key
+    """
+    if isinstance(p, PointView):
+        return mix64(id(p.array) ^ mix64(p.index))
+
+    return mix64(id(p))
+
+
+def fingerprint(points: Iterable[PointBase], /) -> int:
+    """
+    Returns XOR of keys of points.
+    Equal sets of points have equal fingerprints, a fingerprint is updated in O(1) when a point joins or leaves
+    """
+    key = 0
+    for p in points:
+        key ^= point_key(p)
+
+    return key
+
+
 @final
 class PointAlias:
-    __slots__ = '_points', '_fi'
+    __slots__ = '_points', '_fi', '_key', '_weight'
 
     def __init__(self, fi: float, /):
         self._fi = fi
         self._points: list[PointBase] = []
+        self._key = 0
+        self._weight = 0.
 
     @property
     def fi(self, /):
@@ -24,8 +58,24 @@ class PointAlias:
     def points(self, /):
         return ListView(self._points)
 
-    def alias(self, p: PointBase, /):
+    @property
+    def key(self, /):
+        """
+        Fingerprint of points of the alias
+        """
+        return self._key
+
+    @property
+    def weight(self, /):
+        """
+        Sum of weights of points of the alias
+        """
+        return self._weight
+
+    def alias(self, p: PointBase, weight: float = 1., /):
         self._points.append(p)
+        self._key ^= point_key(p)
+        self._weight += weight
 
     def __lt__(self, other, /):
         if isinstance(other, PointAlias):
@@ -36,22 +86,47 @@ class PointAlias:
 
 @final
 class Group:
-    __slots__ = '_sector', '_points', '_hash'
+    __slots__ = '_sector', '_points', '_key', '_weight', '_ids', '_hash'
 
     def __init__(self, sector: SectorBase, aliases: Iterable[PointAlias], /):
-        self._sector = sector.fix()
         points: list[PointBase] = []
+        key = 0
+        weight = 0.
         for alias in aliases:
             points += alias.points
+            key ^= alias.key
+            weight += alias.weight
 
-        self._points = points
-        ids = self.points_ids
-        if len(points) != len(ids):
+        self._init(sector, points, key, weight)
+        if len(points) != len(self.points_ids):
             raise ValueError(f'some points are repeated')
 
+    @classmethod
+    def from_points(cls, sector: SectorBase, points: list[PointBase], /,
+                    key: int = None, weight: float = None) -> 'Group':
+        """
+        Creates a group without checking points for repeats.
+        The fingerprint of points is computed if the key is not passed.
+        If the weight is not passed, every point weighs 1
+        """
+        self = cls.__new__(cls)
+        self._init(
+            sector,
+            points,
+            fingerprint(points) if key is None else key,
+            float(len(points)) if weight is None else weight,
+        )
+        return self
+
+    def _init(self, sector: SectorBase, points: list[PointBase], key: int, weight: float, /):
+        self._sector = sector.fix()
+        self._points = points
+        self._key = key
+        self._weight = weight
+        self._ids = None
         # Groups are identical if they contain the same points
         # Sectors' arms are not important
-        self._hash = hash(frozenset((sector.arc, sector.circle, ids)))
+        self._hash = hash((sector.arc, sector.circle, key))
 
     @property
     def sector(self, /):
@@ -62,12 +137,32 @@ class Group:
         return ListView(self._points)
 
     @property
-    def points_ids(self, /):
-        return frozenset(id(p) for p in self._points)
+    def weight(self, /) -> float:
+        """
+        Sum of weights of points, the number of points if points are not weighted
+        """
+        return self._weight
+
+    @property
+    def fingerprint(self, /) -> int:
+        """
+        XOR of keys of points, see point_key
+        """
+        return self._key
+
+    @property
+    def points_ids(self, /) -> frozenset[int]:
+        if self._ids is None:
+            self._ids = frozenset(id(p) for p in self._points)
+
+        return self._ids
 
     def __eq__(self, other, /):
         if isinstance(other, Group):
+            # Compare cheap properties first, sets of points are compared only for matching fingerprints
             return (
+                self._key == other._key and
+                len(self._points) == len(other._points) and
                 self.sector.arc == other.sector.arc and
                 self.sector.circle == other.sector.circle and
                 self.points_ids == other.points_ids
@@ -77,11 +172,7 @@ class Group:
 
     def __ne__(self, other, /):
         if isinstance(other, Group):
-            return (
-                self.sector.arc != other.sector.arc or
-                self.sector.circle != other.sector.circle or
-                self.points_ids != other.points_ids
-            )
+            return not self.__eq__(other)
 
         return NotImplemented
 
@@ -97,28 +188,162 @@ def circular_subtraction(a1: float, a2: float, /) -> float:
     return a1 - a2 if a1 >= a2 else a1 - a2 + TWOPI
 
 
-def find_all_groups(sector: SectorBase, points: Iterable[PointBase], /,
+def find_windows(fi: np.ndarray, arc: float, /, align: bool = False) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Runs the vectorized sweep over angles of aliases sorted in descending order.
+    Returns first and afterlast indexes of aliases inside every group and start arms of groups' sectors
+    """
+    # region Handle trivial cases
+    n = len(fi)
+    if n == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty, np.empty(0)
+    if n == 1:
+        return np.array([0]), np.array([1]), reduce_angles(fi + arc / 2)
+    # endregion
+
+    first, afterlast, start = sweep_windows(fi, arc)
+    if align:
+        start = align_windows(fi, arc, first, afterlast, start, one_deg, two_deg)
+
+    return first, afterlast, start
+
+
+def point_weights(points: Union[PointGrid, PointArray, Sequence[PointBase]], weights: Optional[Iterable[Real]], /
+                  ) -> Optional[np.ndarray]:
+    """
+    Returns weights passed along with points or weights of a PointArray.
+    None means every point weighs 1
+    """
+    if weights is not None:
+        return weights_column(weights, len(points))
+
+    if isinstance(points, PointGrid):
+        points = points.array
+
+    if isinstance(points, PointArray):
+        return points.weights
+
+    return None
+
+
+def find_all_groups(sector: SectorBase, points: Union[PointGrid, PointArray, Iterable[PointBase]], /,
                     align: bool = False, *,
-                    debug: bool = False) -> Iterator[Group]:
+                    weights: Iterable[Real] = None,
+                    vectorized: bool = False,
+                    tolerance: Real = 0.,
+                    instrumentation: Instrumentation = None) -> Iterator[Group]:
+    """
+    Finds all groups of points which can be placed inside the sector rotated around its circle.
+    Points which angles differ by at most tolerance are treated as collinear with the center, see alias_angles.
+    If instrumentation is passed, it receives timings of phases, counters and steps of the sweep
+    """
+    check_tolerance(tolerance, sector.arc)
+    inst = instrumentation
+    timed = inst is not None
+    if vectorized:
+        if not timed:
+            yield from PreparedPoints(sector.circle, points, weights, tolerance).find_all_groups(sector.arc, align)
+            return
+
+        start = perf_counter()
+        prepared = PreparedPoints(sector.circle, points, weights, tolerance)
+        inst.phase('prepare', perf_counter() - start)
+        inst.count('points', len(prepared.indices))
+        inst.count('aliases', len(prepared.angles))
+        inst.alias_sizes(Counter(np.diff(prepared.offsets).tolist()))
+
+        start = perf_counter()
+        groups = prepared.find_group_set(sector.arc, align)
+        inst.phase('sweep', perf_counter() - start)
+        inst.count('groups', len(groups))
+        yield from groups
+        return
+
     # Copy sector to avoid manipulations outside
     sector = sector.copy() if isinstance(sector, MutableSector) else sector.unfix()
     # Remove points outside circle
-    points = [p for p in points if p in sector.circle]
+    if timed:
+        start = perf_counter()
+
+    # Distances and angles relative to the center are computed in one pass without creating points
+    circle = sector.circle
+    if isinstance(points, PointGrid):
+        weights = point_weights(points, weights)
+        inside = circle.indices_of_points_inside(points)
+        _, angles = relative_polar(points.array[inside], circle.center)
+        points = points.points
+    else:
+        if not isinstance(points, PointArray):
+            points = list(points)
+
+        weights = point_weights(points, weights)
+        r2, angles = relative_polar(points, circle.center, circle.r2)
+        inside = np.flatnonzero(r2 <= circle.r2)
+        angles = angles[inside]
+
+    weight_column = np.ones(len(inside)) if weights is None else weights[inside]
+    weights = weight_column.tolist()
+    points = [points[i] for i in inside.tolist()]
+    if len(set(map(id, points))) != len(points):
+        raise ValueError(f'some points are repeated')
+
+    if timed:
+        inst.phase('filter', perf_counter() - start)
+        inst.count('points', len(points))
+        start = perf_counter()
 
     # region Alias points
-    center = sector.circle.center
-    fi2alias = {}
-    for p in points:
-        fi = (p - center).fi
-        alias = fi2alias.get(fi)
-        if alias is None:
+    if tolerance > 0:
+        # Close angles are merged after sorting, see alias_angles
+        angles, order, offsets = alias_angles(angles, tolerance)
+        if timed:
+            inst.phase('sort', perf_counter() - start)
+            start = perf_counter()
+
+        aliases = []
+        order = order.tolist()
+        offsets = offsets.tolist()
+        for i, fi in enumerate(angles.tolist()):
             alias = PointAlias(fi)
-            fi2alias[alias.fi] = alias
+            for k in order[offsets[i]:offsets[i + 1]]:
+                alias.alias(points[k], weights[k])
+
+            aliases.append(alias)
+
+        aliases = CyclicList(aliases)
+        if timed:
+            inst.phase('alias', perf_counter() - start)
+    else:
+        fi2alias = {}
+        for p, w, fi in zip(points, weights, angles.tolist()):
+            alias = fi2alias.get(fi)
+            if alias is None:
+                alias = PointAlias(fi)
+                fi2alias[alias.fi] = alias
+
+            alias.alias(p, w)
+
+        if timed:
+            inst.phase('alias', perf_counter() - start)
+            start = perf_counter()
+
+        aliases = CyclicList(sorted(fi2alias.values(), reverse=True))
+        # Points of aliases in the same order, equal angles keep the original order
+        order = np.argsort(-angles, kind='stable')
+        offsets = [0]
+        for alias in aliases:
+            offsets.append(offsets[-1] + len(alias.points))
 
-        alias.alias(p)
+        if timed:
+            inst.phase('sort', perf_counter() - start)
 
-    aliases = CyclicList(sorted(fi2alias.values(), reverse=True))
-    del points, center, fi2alias
+    # Weights of groups are sums of ranges of weights of points, like in PreparedPoints
+    sums, errors = compensated_sums(weight_column[order]).tolist()
+    del points, weights, weight_column, angles, order, circle
+    if timed:
+        inst.count('aliases', len(aliases))
+        inst.alias_sizes(Counter(len(a.points) for a in aliases))
     # endregion
 
     # region Handle trivial cases
@@ -128,25 +353,38 @@ def find_all_groups(sector: SectorBase, points: Iterable[PointBase], /,
     if n == 1:
         a = aliases[0]
         sector.start_arm = a.fi + sector.arc / 2
-        yield Group(sector.fix(), [a])
+        if timed:
+            inst.count('groups')
+
+        yield Group.from_points(sector.fix(), list(a.points), a.key, range_sums(sums, errors, 0, offsets[1], 0))
         return
     # endregion
 
+    sweep = Timer()
+    if timed:
+        sweep.start()
+
+    steps = timed and inst.steps
+
     # region Init sector and indexes
     sector.start_arm = aliases[0].fi
     first = 0
     afterlast = 1
+    # Fingerprint of points inside is updated along with indexes
+    key = aliases[0].key
 
     # Find index of first point not inside
-    while afterlast < n and aliases[afterlast].fi in sector:
+    while afterlast < n and circular_subtraction(aliases[0].fi, aliases[afterlast].fi) <= sector.arc:
+        key ^= aliases[afterlast].key
         afterlast += 1
 
+    afterlast0 = afterlast
+    # If the arc holds all points, the window of all aliases is met at every alias, it is formed once
+    whole = afterlast0 == n
     # endregion
 
-    def align_sector():
-        nonlocal counter, aliases, first, afterlast, sector, debug
-        counter += 1
-
+    def align_sector() -> SectorBase:
+        # Aligned sector is a copy, the sweep itself continues from the current position of the sector
         a1 = aliases[first]
         an = aliases[afterlast - 1]
 
@@ -157,78 +395,915 @@ def find_all_groups(sector: SectorBase, points: Iterable[PointBase], /,
 
         # Do not align if wing is less than 1° or deltas are less than 2°
         if wing < one_deg or delta1 < two_deg or delta2 < two_deg:
-            if debug: print(f'{counter}. wing or deltas are to small: '
-                            f'{deg(wing)=:.1f}°, {deg(delta1)=:.1f}°, {deg(delta2)=:.1f}°')
-            return
+            if timed:
+                inst.count('align.skipped')
 
-        if wing < delta1 and wing < delta2:
-            sector.start_arm = a1.fi + wing
+            return sector
 
-            if debug: print(f'{counter}. wing < delta1 and wing < delta2: '
-                            f'{deg(wing)=:.0f}°, {deg(delta1)=:.0f}°, {deg(delta2)=:.0f}°')
+        aligned = sector.copy()
+        if wing < delta1 and wing < delta2:
+            aligned.start_arm = a1.fi + wing
+            if timed:
+                inst.count('align.centered')
 
         elif wing < delta1:  # wing >= delta2
-            sector.end_arm = an.fi - delta2 / 2
-
-            if debug: print(f'{counter}. wing < delta1 and wing >= delta2: '
-                            f'{deg(wing)=:.0f}°, {deg(delta1)=:.0f}°, {deg(delta2)=:.0f}°')
+            aligned.end_arm = an.fi - delta2 / 2
+            if timed:
+                inst.count('align.end')
 
         elif wing < delta2:  # wing >= delta1
-            sector.start_arm = a1.fi + delta1 / 2
+            aligned.start_arm = a1.fi + delta1 / 2
+            if timed:
+                inst.count('align.start')
 
-            if debug: print(f'{counter}. wing >= delta1 and wing < delta2: '
-                            f'{deg(wing)=:.0f}°, {deg(delta1)=:.0f}°, {deg(delta2)=:.0f}°')
         else:
             raise RuntimeError('unreachable code reached')
 
-    # region Form first group
-    if align:
-        counter = 0
-        align_sector()
+        return aligned
 
-    first_group = Group(sector, aliases[first:afterlast])
-    yield first_group
-    # endregion
+    def form_group() -> Group:
+        points = []
+        for alias in aliases.view(first, afterlast):
+            points += alias.points
+
+        # Running sums of weights would lose small weights next to large ones
+        turns = afterlast // n - first // n
+        weight = range_sums(sums, errors, offsets[first % n], offsets[afterlast % n], turns)
+        group = Group.from_points(align_sector() if align else sector, points, key, weight)
+        # Time spent by the consumer is not a part of the sweep
+        if timed:
+            inst.count('groups')
+            sweep.stop()
+
+        return group
+
+    try:
+        # region Form first group
+        yield form_group()
+        if timed:
+            sweep.start()
+        # endregion
+
+        index = 0
+        while True:
+            p1 = aliases[first]
+            pn1 = aliases[afterlast]
 
-    while True:
-        p1 = aliases[first]
-        pn1 = aliases[afterlast]
-        alpha = circular_subtraction(sector.start_arm, p1.fi)
-        omega = circular_subtraction(sector.end_arm, pn1.fi)
-
-        # Try to rotate sector by such angle that
-        # only first point inside (p1) will be excluded
-        # and first point not inside (pn1) will not be included
-        if alpha >= omega:
-            # Not possible to exclude p1 and not include pn1
-            # Rotating end arm to pn1 forms a new group with the same first point
-            sector.end_arm = pn1.fi
-            afterlast += 1
-        else:  # alpha < omega
-            # It is possible to exclude p1 and not include pn1
-            # Rotate start arm to p1, this action will not change group
-            sector.start_arm = p1.fi
-
-            if first == afterlast - 1:
-                # p1 is the only point inside
-                # Rotate end arm to pn1, it will form a new group
+            # Try to rotate sector by such angle that
+            # only first point inside (p1) will be excluded
+            # and first point not inside (pn1) will not be included.
+            # Angle between start arm and p1 is not less than angle between end arm and pn1
+            # if and only if angle between p1 and pn1 does not exceed the arc.
+            # The latter is compared directly, so ties do not depend on rounding errors
+            # accumulated in sector's arms. If all points are inside, pn1 is p1 itself
+            if afterlast - first < n and circular_subtraction(p1.fi, pn1.fi) <= sector.arc:
+                # Not possible to exclude p1 and not include pn1
+                # Rotating end arm to pn1 forms a new group with the same first point
                 sector.end_arm = pn1.fi
-                first = afterlast
+                key ^= pn1.key
                 afterlast += 1
+                action = 'extend'
             else:
-                gamma = circular_subtraction(p1.fi, aliases[first + 1].fi)  # angle to second point inside
-                omega = circular_subtraction(sector.end_arm, pn1.fi)  # angle to pn1 after rotation
-                rho = min(gamma, omega) / 2
-                sector.rotate(rho)
-                first += 1
+                # It is possible to exclude p1 and not include pn1
+                # Rotate start arm to p1, this action will not change group
+                sector.start_arm = p1.fi
+
+                if first == afterlast - 1:
+                    # p1 is the only point inside
+                    # Rotate end arm to pn1, it will form a new group
+                    sector.end_arm = pn1.fi
+                    key = pn1.key
+                    first = afterlast
+                    afterlast += 1
+                    action = 'jump'
+                else:
+                    gamma = circular_subtraction(p1.fi, aliases[first + 1].fi)  # angle to second point inside
+                    omega = circular_subtraction(sector.end_arm, pn1.fi)  # angle to pn1 after rotation
+                    rho = min(gamma, omega) / 2
+                    sector.rotate(rho)
+                    key ^= p1.key
+                    first += 1
+                    action = 'rotate'
+
+            if steps:
+                index += 1
+                inst.step(Step(index, action, first, afterlast, sector.start_arm))
+
+            # If new group is identical to the first one after a full turn, stop iteration.
+            # After the turn the first point of the first group is the first inside again,
+            # hence comparing sizes is enough. The first group may contain all points,
+            # such group can be met before the turn ends
+            if first >= n and afterlast - first == afterlast0:
+                break
+
+            if afterlast - first == n:
+                if whole:
+                    continue
+
+                whole = True
+
+            # Form new group
+            yield form_group()
+            if timed:
+                sweep.start()
+
+        if timed:
+            sweep.stop()
+    finally:
+        if timed:
+            inst.phase('sweep', sweep.seconds)
+
+
+@final
+class PreparedPoints:
+    """
+    Points inside a circle aliased and sorted once to run the sweep for many arcs.
+    Items of a PointArray are not created in advance, a view of a point is created on the first access and kept.
+    Instances are immutable and can be shared between threads
+    """
+    __slots__ = (
+        '_circle', '_points', '_array', '_views', '_indices', '_fi', '_offsets', '_keys', '_weights', '_tolerance',
+    )
+
+    def __init__(self, circle: CircleBase, points: Union[PointGrid, PointArray, Iterable[PointBase]], /,
+                 weights: Iterable[Real] = None,
+                 tolerance: Real = 0.):
+        circle = circle.fix()
+        # Angles of columns are computed by np.arctan2, angles of other points are the same as PointBase.fi
+        exact = not isinstance(points, (PointGrid, PointArray))
+
+        # Remove points outside circle
+        if isinstance(points, PointGrid):
+            inside = circle.indices_of_points_inside(points)
+            points, array = points.points, points.array
+        else:
+            points, array = point_columns(points)
+            inside = circle.indices_of_points_inside(array)
+
+        # Alias points
+        relative = array[inside] - circle.center
+        fi, order, offsets = alias_angles(arctan2(relative.y, relative.x, exact), tolerance)
+        self._init(circle, points, inside[order], fi, offsets, point_weights(array, weights), float(tolerance))
+
+    def _init(self, circle: FixedCircle, points: Sequence[PointBase], indices: np.ndarray, fi: np.ndarray,
+              offsets: np.ndarray, weights: Optional[np.ndarray], tolerance: float = 0., /):
+        if weights is not None:
+            weights = compensated_sums(weights[indices])
+
+        for a in (fi, indices, offsets, weights):
+            if a is not None:
+                a.flags.writeable = False
+
+        self._circle = circle
+        self._indices = indices
+        self._fi = fi
+        self._offsets = offsets
+        self._keys = None
+        self._weights = weights
+        self._tolerance = tolerance
+        # Items of a PointArray are new objects on every access, other points may be repeated
+        if isinstance(points, PointArray):
+            self._points = None
+            self._array = points
+            self._views = {}
+        else:
+            self._points = tuple(points[i] for i in indices.tolist())
+            self._array = None
+            self._views = None
+            if len(set(map(id, self._points))) != len(self._points):
+                raise ValueError(f'some points are repeated')
+
+    @classmethod
+    def from_aliases(cls, circle: CircleBase, points: Union[PointArray, Sequence[PointBase]], indices: np.ndarray,
+                     angles: np.ndarray, offsets: np.ndarray, /, weights: Iterable[Real] = None) -> 'PreparedPoints':
+        """
+        Restores prepared points from aliases computed elsewhere, see properties with the same names
+        """
+        self = cls.__new__(cls)
+        self._init(circle.fix(), points, indices, angles, offsets, point_weights(points, weights))
+        return self
+
+    @classmethod
+    def for_circles(cls, circles: Iterable[CircleBase], points: Union[PointGrid, PointArray, Iterable[PointBase]], /,
+                    weights: Iterable[Real] = None,
+                    chunk_size: int = 1 << 20) -> Iterator['PreparedPoints']:
+        """
+        Prepares points for every circle.
+        Points are indexed by a grid once, only points inside cells covering a circle are tested and aliased.
+        Circles are processed together in chunks of about chunk_size candidate points
+        """
+        circles = [c.fix() for c in circles]
+        # Angles are computed like in the constructor
+        exact = not isinstance(points, (PointGrid, PointArray))
+        grid = points if isinstance(points, PointGrid) else PointGrid(points)
+        points = grid.points
+        weights = point_weights(grid, weights)
+        x, y = grid.array.x, grid.array.y
+
+        cx = np.fromiter((c.center.x for c in circles), float, len(circles))
+        cy = np.fromiter((c.center.y for c in circles), float, len(circles))
+        radius = np.fromiter((c.radius for c in circles), float, len(circles))
+        # Pad boxes by a few ulps, so rounding errors cannot drop points on the boundary
+        pad = 4 * np.spacing(np.maximum(np.abs(cx), np.abs(cy)) + radius)
+        x0, x1 = cx - radius - pad, cx + radius + pad
+        y0, y1 = cy - radius - pad, cy + radius + pad
+        lo, hi, boxes = grid.ranges_in_boxes(x0, y0, x1, y1)
+        ends = np.cumsum(np.bincount(boxes, hi - lo, len(circles)).astype(np.intp))
+
+        start = 0
+        while start < len(circles):
+            before = int(ends[start - 1]) if start > 0 else 0
+            stop = max(start + 1, int(np.searchsorted(ends, before + chunk_size, 'right')))
+
+            # region Test candidates of all circles in chunk
+            indices, cid = grid.indices_in_boxes(x0[start:stop], y0[start:stop], x1[start:stop], y1[start:stop])
+            cid += start
+            dx = x[indices] - cx[cid]
+            dy = y[indices] - cy[cid]
+            inside = (dx * dx + dy * dy) <= radius[cid] * radius[cid]
+            cid, indices = cid[inside], indices[inside]
+            fi = arctan2(dy[inside], dx[inside], exact)
+            # endregion
+
+            # region Alias points of all circles in chunk
+            # Order by circle, then by angle descending, equal angles keep the original order
+            order = np.lexsort((indices, -fi, cid))
+            cid, indices, fi = cid[order], indices[order], fi[order]
+            heads = np.ones(len(fi), dtype=bool)
+            heads[1:] = (cid[1:] != cid[:-1]) | (fi[1:] != fi[:-1])
+            heads = np.flatnonzero(heads)
+            bounds = np.searchsorted(cid, np.arange(start, stop + 1))
+            head_bounds = np.searchsorted(heads, bounds)
+            # endregion
+
+            for i in range(stop - start):
+                b0, b1 = int(bounds[i]), int(bounds[i + 1])
+                h = heads[head_bounds[i]:head_bounds[i + 1]]
+                offsets = np.empty(len(h) + 1, dtype=np.intp)
+                offsets[:-1] = h - b0
+                offsets[-1] = b1 - b0
+
+                self = cls.__new__(cls)
+                self._init(circles[start + i], points, indices[b0:b1].copy(), fi[h], offsets, weights)
+                yield self
+
+            start = stop
+
+    @property
+    def circle(self, /):
+        return self._circle
+
+    @property
+    def points(self, /) -> tuple[PointBase, ...]:
+        """
+        Points inside the circle ordered by aliases.
+        Views of all points of a PointArray are created on access
+        """
+        if self._points is None:
+            return tuple(self._point_views(0, len(self._indices)))
+
+        return self._points
+
+    def _point_views(self, start: int, stop: int, /) -> list[PointBase]:
+        """
+        Returns points of a PointArray between positions, the same view is returned for a point every time
+        """
+        views = self._views
+        array = self._array
+        points = []
+        for position, index in enumerate(self._indices[start:stop].tolist(), start):
+            view = views.get(position)
+            if view is None:
+                # Another thread may create the view at the same time, the first one is kept
+                view = views.setdefault(position, array[index])
+
+            points.append(view)
+
+        return points
+
+    @property
+    def tolerance(self, /) -> float:
+        """
+        Tolerance of aliasing, arcs of sweeps must be larger
+        """
+        return self._tolerance
+
+    @property
+    def indices(self, /) -> np.ndarray:
+        """
+        Indexes of points in the original sequence ordered by aliases
+        """
+        return self._indices
+
+    @property
+    def angles(self, /) -> np.ndarray:
+        """
+        Angles of aliases in descending order
+        """
+        return self._fi
+
+    @property
+    def offsets(self, /) -> np.ndarray:
+        """
+        Offsets of aliases in points, points of alias i are points[offsets[i]:offsets[i + 1]]
+        """
+        return self._offsets
+
+    @property
+    def keys(self, /) -> np.ndarray:
+        """
+        Prefix fingerprints of aliases, the fingerprint of aliases before alias i is keys[i].
+        Points of a PointArray are identified by the array and their indexes like in point_key,
+        so their views are not created.
+        Computed on the first access
+        """
+        if self._keys is None:
+            keys = np.zeros(len(self._fi) + 1, dtype=np.uint64)
+            if len(self._fi) > 0:
+                if self._points is None:
+                    ids = mix64s(self._indices) ^ np.uint64(id(self._array))
+                else:
+                    ids = np.fromiter(map(id, self._points), np.uint64, len(self._points))
+
+                alias_keys = np.bitwise_xor.reduceat(mix64s(ids), self._offsets[:-1])
+                np.bitwise_xor.accumulate(alias_keys, out=keys[1:])
+
+            keys.flags.writeable = False
+            self._keys = keys
+
+        return self._keys
+
+    @property
+    def weighted(self, /) -> bool:
+        return self._weights is not None
+
+    @property
+    def weight_sums(self, /) -> np.ndarray:
+        """
+        Prefix sums of weights of points in the order of aliases and prefix sums of their rounding errors,
+        see compensated_sums. If points are not weighted, every point weighs 1
+        """
+        if self._weights is None:
+            sums = np.zeros((2, len(self._indices) + 1))
+            sums[0] = np.arange(len(self._indices) + 1)
+            return sums
+
+        return self._weights
+
+    def group_sizes(self, first: np.ndarray, afterlast: np.ndarray, /) -> np.ndarray:
+        """
+        Returns numbers of points of aliases between first and afterlast indexes which may wrap around
+        """
+        offsets = self._offsets
+        n = len(self._fi)
+
+        def position(index: np.ndarray, /) -> np.ndarray:
+            return offsets[index % n] + index // n * offsets[n]
+
+        return position(afterlast) - position(first)
+
+    def group_weights(self, first: np.ndarray, afterlast: np.ndarray, /) -> np.ndarray:
+        """
+        Returns weights of points of aliases between first and afterlast indexes which may wrap around.
+        Weights are sums of ranges of compensated prefix sums, so small weights are not lost next to large ones
+        """
+        if self._weights is None:
+            return self.group_sizes(first, afterlast).astype(float)
+
+        offsets = self._offsets
+        n = len(self._fi)
+        return range_sums(*self._weights, offsets[first % n], offsets[afterlast % n], afterlast // n - first // n)
+
+    def group_keys(self, first: np.ndarray, afterlast: np.ndarray, /) -> np.ndarray:
+        """
+        Returns fingerprints of points of aliases between first and afterlast indexes which may wrap around
+        """
+        keys = self.keys
+        n = len(self._fi)
+
+        def prefix(index: np.ndarray, /) -> np.ndarray:
+            # Every full turn adds the fingerprint of all aliases
+            return keys[index % n] ^ np.where(index // n % 2 == 1, keys[n], np.uint64(0))
+
+        return prefix(afterlast) ^ prefix(first)
+
+    def __len__(self, /):
+        return len(self._indices)
+
+    def __repr__(self, /):
+        return f'{self.__class__.__name__}({self._circle}, {len(self._indices)} points, {len(self._fi)} aliases)'
+
+    def group_points(self, first: int, afterlast: int, /) -> list[PointBase]:
+        """
+        Returns points of aliases between first and afterlast indexes which may wrap around
+        """
+        n = len(self._fi)
+        first, afterlast = first % n, afterlast - first + first % n
+        offsets = self._offsets
+        if self._points is None:
+            if afterlast <= n:
+                return self._point_views(offsets[first], offsets[afterlast])
+
+            return self._point_views(offsets[first], offsets[n]) + self._point_views(0, offsets[afterlast - n])
+
+        points = self._points
+        if afterlast <= n:
+            return list(points[offsets[first]:offsets[afterlast]])
+
+        return list(points[offsets[first]:]) + list(points[:offsets[afterlast - n]])
+
+    def find_group_set(self, arc: Real, /, align: bool = False) -> 'GroupSet':
+        check_arc(arc)
+        check_tolerance(self._tolerance, arc)
+        arc = float(arc)
+        return GroupSet(self, arc, *find_windows(self._fi, arc, align))
+
+    def find_all_groups(self, arc: Real, /, align: bool = False) -> Iterator[Group]:
+        """
+        Yields groups of find_group_set, the sweep runs in parts on demand, see iter_group_sets
+        """
+        for groups in self.iter_group_sets(arc, align):
+            yield from groups
+
+    def find_best_group(self, arc: Real, /, align: bool = False) -> Optional[Group]:
+        """
+        Returns the group with the most points or None if there are no points.
+        If points are weighted, returns the group with the largest weight.
+        Every group is inside the window of aliases ending at some alias and weights are not negative,
+        so only such windows are counted and the largest one is created.
+        If several windows are the largest, the one ending at the alias with the largest angle is chosen.
+        The end arm of the sector is at the last point unless the sector is aligned
+        """
+        check_arc(arc)
+        check_tolerance(self._tolerance, arc)
+        arc = float(arc)
+        fi = self._fi
+        n = len(fi)
+        if n == 0:
+            return None
+        if n == 1:
+            return self.find_group_set(arc, align)[0]
+
+        # First index of the window ending at alias j is the first alias which limit exceeds j
+        limits = sweep_limits(fi, arc)
+        j = np.arange(n)
+        first = np.searchsorted(np.concatenate((limits - n, limits)), j, 'right') - n
+        first = np.maximum(first, j - n + 1)
+
+        # Count points with multiplicities of aliases
+        best = int(np.argmax(self.group_weights(first, j + 1)))
+        first, afterlast = int(first[best]), best + 1
+        if first < 0:
+            first, afterlast = first + n, afterlast + n
+
+        first = np.array([first])
+        afterlast = np.array([afterlast])
+        start = reduce_angles(fi[best:best + 1] + arc)
+        if align:
+            start = align_windows(fi, arc, first, afterlast, start, one_deg, two_deg)
+
+        return GroupSet(self, arc, first, afterlast, start)[0]
+
+    def _sweep_parts(self, arc: float, chunk_size: int, /) -> Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Runs the sweep over at least 2 aliases in parts of chunk_size removals, see sweep_events.
+        Yields first and afterlast indexes and start arms of groups of every part, the first part is the first group.
+        Parts joined in order are the groups of find_windows without alignment
+        """
+        fi = self._fi
+        n = len(fi)
+        afterlast0 = int(sweep_limits(fi, arc, [0])[0])
+        yield np.array([0]), np.array([afterlast0]), fi[:1]
+
+        # The window of all aliases is kept only the first time, like in join_windows
+        whole = afterlast0 == n
+        for lo in range(0, n, chunk_size):
+            first, afterlast, start = sweep_events(fi, arc, lo, min(lo + chunk_size, n), afterlast0)
+            # Stop before the first group is met again after a full turn
+            repeats = (afterlast - first == afterlast0) & (first >= n)
+            done = bool(repeats.any())
+            if done:
+                stop = int(np.argmax(repeats))
+                first, afterlast, start = first[:stop], afterlast[:stop], start[:stop]
+
+            keep = afterlast - first != n
+            if not keep.all():
+                if not whole:
+                    keep[np.argmin(keep)] = True
+                    whole = True
+
+                first, afterlast, start = first[keep], afterlast[keep], start[keep]
+
+            yield first, afterlast, start
+            if done:
+                return
+
+    def iter_group_sets(self, arc: Real, /, align: bool = False, chunk_size: int = 1 << 16) -> Iterator['GroupSet']:
+        """
+        Runs the sweep like find_group_set in parts of chunk_size removals and yields groups of every part.
+        Parts are computed on demand, joined in order they are the groups of find_group_set
+        """
+        check_arc(arc)
+        check_tolerance(self._tolerance, arc)
+        if chunk_size < 1:
+            raise ValueError(f'chunk size must be positive, got {chunk_size}')
+
+        arc = float(arc)
+        fi = self._fi
+        if len(fi) < 2:
+            yield self.find_group_set(arc, align)
+            return
+
+        for first, afterlast, start in self._sweep_parts(arc, chunk_size):
+            if align:
+                start = align_windows(fi, arc, first, afterlast, start, one_deg, two_deg)
+
+            yield GroupSet(self, arc, first, afterlast, start)
+
+    def find_top_groups(self, arc: Real, k: int, /, align: bool = False, chunk_size: int = 1 << 16) -> 'GroupSet':
+        """
+        Returns k largest distinct groups like find_group_set(arc, align).top(k) without keeping all groups.
+        The sweep runs in parts of chunk_size removals, only k best groups are kept between parts,
+        so memory beyond prepared points depends on k, chunk_size and the number of aliases, not on the number of groups
+        """
+        check_arc(arc)
+        check_tolerance(self._tolerance, arc)
+        if k < 0:
+            raise ValueError(f'k must be non-negative, got {k}')
+        if chunk_size < 1:
+            raise ValueError(f'chunk size must be positive, got {chunk_size}')
+
+        arc = float(arc)
+        fi = self._fi
+        n = len(fi)
+        if n < 2 or k == 0:
+            return self.find_group_set(arc, align).top(k)
+
+        # Indexes are positions of groups in the sweep
+        first = afterlast = indices = sizes = np.empty(0, dtype=np.intp)
+        start = np.empty(0)
+        count = 0
+        for part_first, part_afterlast, part_start in self._sweep_parts(arc, chunk_size):
+            first = np.concatenate((first, part_first))
+            afterlast = np.concatenate((afterlast, part_afterlast))
+            start = np.concatenate((start, part_start))
+            indices = np.concatenate((indices, np.arange(count, count + len(part_first))))
+            sizes = np.concatenate((sizes, self.group_sizes(part_first, part_afterlast)))
+            count += len(part_first)
+
+            # Earlier groups win ties
+            best = np.lexsort((indices, -sizes))[:k]
+            first, afterlast, start = first[best], afterlast[best], start[best]
+            indices, sizes = indices[best], sizes[best]
 
-        # Form new group
         if align:
-            align_sector()
+            start = align_windows(fi, arc, first, afterlast, start, one_deg, two_deg)
+
+        return GroupSet(self, arc, first, afterlast, start)
+
+
+@final
+class GroupSet:
+    """
+    Groups found inside one circle stored as ranges of aliases of PreparedPoints.
+    Memory does not depend on sizes of groups, Group instances are created on access.
+    Ranges are not reduced, afterlast index may exceed the number of aliases if a group wraps around
+    """
+    __slots__ = '_prepared', '_arc', '_first', '_afterlast', '_start', '_keys', '_weights'
+
+    def __init__(self, prepared: PreparedPoints, arc: float, first: np.ndarray, afterlast: np.ndarray,
+                 start: np.ndarray, /):
+        for a in (first, afterlast, start):
+            a.flags.writeable = False
+
+        self._prepared = prepared
+        self._arc = arc
+        self._first = first
+        self._afterlast = afterlast
+        self._start = start
+        self._keys = None
+        self._weights = None
+
+    @property
+    def prepared(self, /):
+        return self._prepared
+
+    @property
+    def circle(self, /):
+        return self._prepared.circle
+
+    @property
+    def arc(self, /):
+        return self._arc
+
+    @property
+    def first(self, /) -> np.ndarray:
+        """
+        Indexes of the first aliases of groups
+        """
+        return self._first
+
+    @property
+    def afterlast(self, /) -> np.ndarray:
+        """
+        Indexes of the aliases after the last ones of groups
+        """
+        return self._afterlast
+
+    @property
+    def start_arms(self, /) -> np.ndarray:
+        return self._start
+
+    @property
+    def sizes(self, /) -> np.ndarray:
+        """
+        Numbers of points in groups
+        """
+        if len(self._first) == 0:
+            return np.empty(0, dtype=np.intp)
+
+        return self._prepared.group_sizes(self._first, self._afterlast)
+
+    @property
+    def fingerprints(self, /) -> np.ndarray:
+        """
+        Fingerprints of points of groups, see Group.fingerprint.
+        Computed on the first access
+        """
+        if self._keys is None:
+            if len(self._first) == 0:
+                keys = np.empty(0, dtype=np.uint64)
+            else:
+                keys = self._prepared.group_keys(self._first, self._afterlast)
+
+            keys.flags.writeable = False
+            self._keys = keys
+
+        return self._keys
+
+    @property
+    def weights(self, /) -> np.ndarray:
+        """
+        Weights of groups, see Group.weight.
+        Computed on the first access
+        """
+        if self._weights is None:
+            if len(self._first) == 0:
+                weights = np.empty(0)
+            else:
+                weights = self._prepared.group_weights(self._first, self._afterlast)
+
+            weights.flags.writeable = False
+            self._weights = weights
+
+        return self._weights
+
+    def to_arrays(self, /) -> dict[str, np.ndarray]:
+        """
+        Returns plain arrays describing groups
+        """
+        return dict(
+            first=self._first,
+            afterlast=self._afterlast,
+            start_arm=self._start,
+            size=self.sizes,
+            weight=self.weights,
+        )
+
+    def top(self, k: int, /) -> 'GroupSet':
+        """
+        Returns k largest distinct groups ordered by sizes descending.
+        Groups of equal sizes keep the order of the sweep.
+        Use PreparedPoints.find_top_groups to find them without keeping all groups
+        """
+        if k < 0:
+            raise ValueError(f'k must be non-negative, got {k}')
+
+        # Earlier groups win ties
+        order = np.lexsort((np.arange(len(self._first)), -self.sizes))
+        return self[order[:k]]
+
+    def heaviest(self, /) -> Optional[Group]:
+        """
+        Returns the first group with the largest weight or None if there are no groups
+        """
+        if len(self._first) == 0:
+            return None
+
+        return self._group(int(np.argmax(self.weights)))
+
+    def at_least(self, weight: Real, /) -> 'GroupSet':
+        """
+        Returns groups which weights are not less than the given one
+        """
+        return self[np.flatnonzero(self.weights >= weight)]
+
+    def summarize(self, /) -> 'GroupSummary':
+        """
+        Returns statistics of groups
+        """
+        sizes = self.sizes
+        start = self._start
+        if len(sizes) == 0:
+            return GroupSummary(self.circle, self._arc, np.zeros(1, dtype=np.intp), np.nan, np.nan)
+
+        return GroupSummary(
+            self.circle,
+            self._arc,
+            np.bincount(sizes),
+            float(start[np.argmin(sizes)]),
+            float(start[np.argmax(sizes)]),
+        )
+
+    def __len__(self, /):
+        return len(self._first)
+
+    def __repr__(self, /):
+        return f'{self.__class__.__name__}({self.circle}, arc={deg(self._arc):.0f}°, {len(self)} groups)'
+
+    def _check_index(self, index: int, /) -> int:
+        n = len(self._first)
+        if not (-n <= index < n):
+            raise IndexError(f'{self.__class__.__name__} index out of range')
+
+        return int(index) % n
+
+    def points(self, index: int, /) -> ListView[PointBase]:
+        """
+        Returns points of the group without creating the group
+        """
+        index = self._check_index(index)
+        return ListView(self._prepared.group_points(int(self._first[index]), int(self._afterlast[index])))
+
+    def indices(self, index: int, /) -> np.ndarray:
+        """
+        Returns indexes of points of the group in the original sequence
+        """
+        index = self._check_index(index)
+        prepared = self._prepared
+        offsets = prepared.offsets
+        n = len(offsets) - 1
+        first, afterlast = int(self._first[index]), int(self._afterlast[index])
+        first, afterlast = first % n, afterlast - first + first % n
+        if afterlast <= n:
+            return prepared.indices[offsets[first]:offsets[afterlast]]
+
+        return np.concatenate((prepared.indices[offsets[first]:], prepared.indices[:offsets[afterlast - n]]))
+
+    def _group(self, index: int, /) -> Group:
+        sector = FixedSector(self.circle, self._arc, float(self._start[index]))
+        points = self._prepared.group_points(int(self._first[index]), int(self._afterlast[index]))
+        return Group.from_points(sector, points, int(self.fingerprints[index]), float(self.weights[index]))
+
+    @overload
+    def __getitem__(self, index: int, /) -> Group: ...
+
+    @overload
+    def __getitem__(self, indices: Union[slice, np.ndarray], /) -> 'GroupSet': ...
+
+    def __getitem__(self, item, /):
+        if isinstance(item, (int, np.integer)):
+            return self._group(self._check_index(item))
+
+        return GroupSet(self._prepared, self._arc, self._first[item], self._afterlast[item], self._start[item])
+
+    def __iter__(self, /) -> Iterator[Group]:
+        return map(self._group, range(len(self._first)))
+
+
+@final
+class GroupSummary:
+    """
+    Statistics of distinct groups found inside one circle.
+    Extremes are the first smallest and the first largest groups in the order of the sweep
+    """
+    __slots__ = '_circle', '_arc', '_histogram', '_smallest_arm', '_largest_arm'
+
+    def __init__(self, circle: FixedCircle, arc: float, histogram: np.ndarray, smallest_arm: float,
+                 largest_arm: float, /):
+        histogram.flags.writeable = False
+        self._circle = circle
+        self._arc = arc
+        self._histogram = histogram
+        self._smallest_arm = smallest_arm
+        self._largest_arm = largest_arm
+
+    @property
+    def circle(self, /):
+        return self._circle
+
+    @property
+    def arc(self, /):
+        return self._arc
+
+    @property
+    def histogram(self, /) -> np.ndarray:
+        """
+        Numbers of groups by sizes, histogram[k] is the number of groups of k points
+        """
+        return self._histogram
+
+    @property
+    def count(self, /) -> int:
+        return int(self._histogram.sum())
+
+    @property
+    def min_size(self, /) -> int:
+        """
+        Size of the smallest group, 0 if there are no groups
+        """
+        return int(np.argmax(self._histogram > 0)) if self.count else 0
+
+    @property
+    def max_size(self, /) -> int:
+        """
+        Size of the largest group, 0 if there are no groups
+        """
+        return len(self._histogram) - 1
+
+    @property
+    def smallest_sector(self, /) -> Optional[FixedSector]:
+        if self.count == 0:
+            return None
+
+        return FixedSector(self._circle, self._arc, self._smallest_arm)
+
+    @property
+    def largest_sector(self, /) -> Optional[FixedSector]:
+        if self.count == 0:
+            return None
+
+        return FixedSector(self._circle, self._arc, self._largest_arm)
+
+    def __repr__(self, /):
+        return (
+            f'{self.__class__.__name__}('
+            f'{self._circle}, '
+            f'arc={deg(self._arc):.0f}°, '
+            f'{self.count} groups of {self.min_size}..{self.max_size} points'
+            f')'
+        )
+
+
+def find_group_set(sector: SectorBase, points: Union[PointGrid, PointArray, Iterable[PointBase]], /,
+                   align: bool = False, *,
+                   weights: Iterable[Real] = None,
+                   tolerance: Real = 0.) -> GroupSet:
+    """
+    Finds all groups like find_all_groups, but returns them in compact GroupSet
+    """
+    return PreparedPoints(sector.circle, points, weights, tolerance).find_group_set(sector.arc, align)
+
+
+def find_best_group(sector: SectorBase, points: Union[PointGrid, PointArray, Iterable[PointBase]], /,
+                    align: bool = False, *,
+                    weights: Iterable[Real] = None,
+                    tolerance: Real = 0.) -> Optional[Group]:
+    """
+    Returns the group with the most points or the largest weight without finding other groups,
+    see PreparedPoints.find_best_group
+    """
+    return PreparedPoints(sector.circle, points, weights, tolerance).find_best_group(sector.arc, align)
+
+
+def find_heavy_groups(sector: SectorBase, points: Union[PointGrid, PointArray, Iterable[PointBase]],
+                      weight: Real, /,
+                      align: bool = False, *,
+                      weights: Iterable[Real] = None,
+                      tolerance: Real = 0.) -> GroupSet:
+    """
+    Returns distinct groups which weights are not less than the given one.
+    Weights of all groups are computed at once from prefix sums of weights of aliases
+    """
+    return find_group_set(sector, points, align, weights=weights, tolerance=tolerance).at_least(weight)
+
+
+def find_top_groups(sector: SectorBase, points: Union[PointGrid, PointArray, Iterable[PointBase]], k: int, /,
+                    align: bool = False, *,
+                    tolerance: Real = 0.) -> list[Group]:
+    """
+    Returns k largest distinct groups ordered by sizes descending, see PreparedPoints.find_top_groups
+    """
+    return list(PreparedPoints(sector.circle, points, None, tolerance).find_top_groups(sector.arc, k, align))
+
+
+def summarize_groups(sector: SectorBase, points: Union[PointGrid, PointArray, Iterable[PointBase]], /,
+                     align: bool = False, *,
+                     tolerance: Real = 0.) -> GroupSummary:
+    """
+    Runs the sweep like find_all_groups, but only collects statistics of groups without creating them
+    """
+    return find_group_set(sector, points, align, tolerance=tolerance).summarize()
 
-        g = Group(sector, aliases[first:afterlast])
-        # If new group is identical to the first one, stop iteration
-        if g == first_group:
-            break
 
-        yield g
+def find_groups_of_circles(circles: Iterable[CircleBase], arc: Real,
+                           points: Union[PointGrid, PointArray, Iterable[PointBase]], /,
+                           align: bool = False, *,
+                           weights: Iterable[Real] = None) -> Iterator[tuple[FixedCircle, Iterator[Group]]]:
+    """
+    Yields every circle with groups found by a sector of the given arc inside it.
+    Points are filtered and aliased for all circles together, see PreparedPoints.for_circles
+    """
+    check_arc(arc)
+    for prepared in PreparedPoints.for_circles(circles, points, weights):
+        yield prepared.circle, prepared.find_all_groups(arc, align)
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+from collections.abc import AsyncIterator, Iterable
+from concurrent.futures import CancelledError, Executor, TimeoutError
+from typing import Union
+
+from algorithm import Group, find_all_groups
+from common import Real
+from geometry.grid import PointGrid
+from geometry.point import PointArray, PointBase
+from geometry.sector import SectorBase
+from instrumentation import Instrumentation
+
+# End of groups in the queue
+_END = None
+# How often a producer blocked by a full queue checks whether it is stopped, in seconds
+_POLL = 0.05
+
+
+def _produce(loop: asyncio.AbstractEventLoop, queue: asyncio.Queue, stop: threading.Event,
+             batch_size: int, sector: SectorBase, points, /, align: bool, **kwargs):
+    """
+    Runs find_all_groups and puts batches of groups into the queue until the end or the stop.
+    Raised exception is put into the queue as the last item
+    """
+    def put(item, /) -> bool:
+        future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        while True:
+            try:
+                future.result(_POLL)
+                return True
+            except TimeoutError:
+                if stop.is_set():
+                    future.cancel()
+                    return False
+            except CancelledError:
+                return False
+
+    try:
+        batch = []
+        for g in find_all_groups(sector, points, align, **kwargs):
+            if stop.is_set():
+                return
+
+            batch.append(g)
+            if len(batch) == batch_size:
+                if not put(batch):
+                    return
+
+                batch = []
+
+        if batch and not put(batch):
+            return
+    except Exception as e:
+        put(e)
+    else:
+        put(_END)
+
+
+async def afind_all_groups(sector: SectorBase, points: Union[PointGrid, PointArray, Iterable[PointBase]], /,
+                           align: bool = False, *,
+                           weights: Iterable[Real] = None,
+                           vectorized: bool = False,
+                           tolerance: Real = 0.,
+                           instrumentation: Instrumentation = None,
+                           batch_size: int = 256,
+                           max_batches: int = 4,
+                           executor: Executor = None) -> AsyncIterator[Group]:
+    """
+    Asynchronous find_all_groups.
+    The sweep runs in the executor, the default one of the loop if not given,
+    and sends groups back in batches of batch_size groups.
+    Other arguments are passed to find_all_groups, instrumentation is called from the thread of the sweep.
+    At most max_batches batches wait for the consumer, then the sweep is paused.
+    Closing or cancelling the iteration stops the sweep after the current group.
+    The vectorized sweep prepares all points before the first group, this step is not stopped,
+    then it runs in parts and stops before the next part, see PreparedPoints.iter_group_sets
+    """
+    if batch_size < 1:
+        raise ValueError(f'batch size must be positive, got {batch_size}')
+    if max_batches < 1:
+        raise ValueError(f'number of batches must be positive, got {max_batches}')
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(max_batches)
+    stop = threading.Event()
+    producer = loop.run_in_executor(
+        executor,
+        lambda: _produce(loop, queue, stop, batch_size, sector, points, align,
+                         weights=weights, vectorized=vectorized, tolerance=tolerance,
+                         instrumentation=instrumentation),
+    )
+    try:
+        while (batch := await queue.get()) is not _END:
+            if isinstance(batch, Exception):
+                raise batch
+
+            for g in batch:
+                yield g
+
+        await producer
+    finally:
+        stop.set()
+        # Release the producer waiting for a free place
+        while not queue.empty():
+            queue.get_nowait()
@@ -0,0 +1,252 @@
+import os
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional, Union, final
+
+import numpy as np
+
+from algorithm import GroupSet, PreparedPoints, find_windows, one_deg, two_deg
+from common import Real
+from geometry.circle import FixedCircle
+from geometry.grid import PointGrid
+from geometry.point import Cartesian, PointArray, PointBase, arctan2, point_columns
+from geometry.sector import SectorBase, check_arc
+from sweep import alias_angles, align_windows, join_windows, sweep_events, sweep_limits
+
+Cloud = Union[PointArray, Sequence[PointBase]]
+
+
+@final
+class BatchResult:
+    """
+    Groups of one job as ranges of aliases.
+    Indexes refer to points of the job's cloud, see PreparedPoints and GroupSet for meanings of arrays
+    """
+    __slots__ = '_circle', '_arc', '_indices', '_angles', '_offsets', '_first', '_afterlast', '_start'
+
+    def __init__(self, circle: FixedCircle, arc: float, indices: np.ndarray, angles: np.ndarray, offsets: np.ndarray,
+                 first: np.ndarray, afterlast: np.ndarray, start: np.ndarray, /):
+        self._circle = circle
+        self._arc = arc
+        self._indices = indices
+        self._angles = angles
+        self._offsets = offsets
+        self._first = first
+        self._afterlast = afterlast
+        self._start = start
+
+    @property
+    def circle(self, /):
+        return self._circle
+
+    @property
+    def arc(self, /):
+        return self._arc
+
+    @property
+    def indices(self, /) -> np.ndarray:
+        return self._indices
+
+    @property
+    def angles(self, /) -> np.ndarray:
+        return self._angles
+
+    @property
+    def offsets(self, /) -> np.ndarray:
+        return self._offsets
+
+    @property
+    def first(self, /) -> np.ndarray:
+        return self._first
+
+    @property
+    def afterlast(self, /) -> np.ndarray:
+        return self._afterlast
+
+    @property
+    def start_arms(self, /) -> np.ndarray:
+        return self._start
+
+    def __len__(self, /):
+        return len(self._first)
+
+    def __repr__(self, /):
+        return f'{self.__class__.__name__}({self._circle}, {len(self._indices)} points, {len(self)} groups)'
+
+    def group_set(self, points: Cloud, /, weights: Iterable[Real] = None) -> GroupSet:
+        """
+        Maps groups back to points of the job's cloud
+        """
+        prepared = PreparedPoints.from_aliases(
+            self._circle,
+            points,
+            self._indices,
+            self._angles,
+            self._offsets,
+            weights,
+        )
+        return GroupSet(prepared, self._arc, self._first, self._afterlast, self._start)
+
+
+# region Worker
+# Array in shared memory attached by every worker process:
+# coordinates of all clouds for batches and angles of aliases for the parallel sweep
+_memory: Optional[SharedMemory] = None
+_shared: Optional[np.ndarray] = None
+
+
+def _attach(name: str, shape: tuple[int, ...], /):
+    global _memory, _shared
+    _memory = SharedMemory(name)
+    _shared = np.ndarray(shape, dtype=float, buffer=_memory.buf)
+
+
+def _run_chunk(circles: np.ndarray, arcs: np.ndarray, bounds: np.ndarray, exact: np.ndarray, align: bool, /
+               ) -> list[tuple]:
+    """
+    Runs jobs given by circles (x, y, radius), arcs and bounds of clouds in shared coordinates.
+    Angles are exact for clouds which are not columns, like in PreparedPoints
+    """
+    results = []
+    for (cx, cy, radius), arc, (start, stop), e in zip(circles.tolist(), arcs.tolist(), bounds.tolist(),
+                                                       exact.tolist()):
+        circle = FixedCircle(Cartesian(cx, cy), radius)
+        array = PointArray(_shared[0, start:stop], _shared[1, start:stop])
+        inside = circle.indices_of_points_inside(array)
+        relative = array[inside] - circle.center
+        fi, order, offsets = alias_angles(arctan2(relative.y, relative.x, e))
+        results.append((inside[order], fi, offsets, *find_windows(fi, arc, align)))
+
+    return results
+
+
+def _sweep_chunk(arc: float, lo: int, hi: int, afterlast0: int, /) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return sweep_events(_shared, arc, lo, hi, afterlast0)
+
+
+# endregion
+
+
+def _shared_array(shape: tuple[int, ...], /) -> tuple[SharedMemory, np.ndarray]:
+    # Shared memory cannot be empty
+    memory = SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 8))
+    return memory, np.ndarray(shape, dtype=float, buffer=memory.buf)
+
+
+def run_batch(jobs: Iterable[tuple[SectorBase, Cloud]], /, align: bool = False, *,
+              max_workers: int = None,
+              chunk_size: int = 64) -> list[BatchResult]:
+    """
+    Finds groups of many (sector, cloud) jobs in a process pool.
+    Coordinates of distinct clouds are copied once into shared memory, workers receive only circles,
+    arcs and bounds of clouds in chunks of chunk_size jobs and return ranges of aliases.
+    Results are in the order of jobs, use BatchResult.group_set to map them back to points
+    """
+    if chunk_size < 1:
+        raise ValueError(f'chunk size must be positive, got {chunk_size}')
+
+    # region Collect distinct clouds
+    circles = []
+    arcs = []
+    bounds = []
+    exact = []
+    columns = []
+    # Clouds are kept alive with their bounds, so ids of clouds created by jobs on the fly are not reused
+    cloud_bounds = {}
+    total = 0
+    for sector, points in jobs:
+        check_arc(sector.arc)
+        _, cloud = cloud_bounds.get(id(points), (None, None))
+        if cloud is None:
+            _, array = point_columns(points)
+            cloud = total, total + len(array)
+            cloud_bounds[id(points)] = points, cloud
+            columns.append((array, cloud))
+            total += len(array)
+
+        c = sector.circle.fix()
+        circles.append(c)
+        arcs.append(float(sector.arc))
+        bounds.append(cloud)
+        exact.append(not isinstance(points, (PointGrid, PointArray)))
+    # endregion
+
+    if len(circles) == 0:
+        return []
+
+    circle_rows = np.array([(c.center.x, c.center.y, c.radius) for c in circles], dtype=float)
+    arcs = np.array(arcs)
+    bounds = np.array(bounds, dtype=np.intp)
+    exact = np.array(exact, dtype=bool)
+
+    memory, coordinates = _shared_array((2, total))
+    try:
+        for array, (start, stop) in columns:
+            coordinates[0, start:stop] = array.x
+            coordinates[1, start:stop] = array.y
+
+        del coordinates
+        with ProcessPoolExecutor(max_workers, initializer=_attach, initargs=(memory.name, (2, total))) as executor:
+            futures = [
+                executor.submit(_run_chunk, circle_rows[i:i + chunk_size], arcs[i:i + chunk_size],
+                                bounds[i:i + chunk_size], exact[i:i + chunk_size], align)
+                for i in range(0, len(circles), chunk_size)
+            ]
+            rows = [row for future in futures for row in future.result()]
+    finally:
+        memory.close()
+        memory.unlink()
+
+    return [BatchResult(c, arc, *row) for c, arc, row in zip(circles, arcs.tolist(), rows)]
+
+
+def parallel_windows(fi: np.ndarray, arc: float, /, align: bool = False, *,
+                     chunks: int = None,
+                     max_workers: int = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Runs the sweep like find_windows, but splits the turn into chunks swept in a process pool.
+    Every chunk starts at the removal of some point, the state of the sweep there is found by a binary search.
+    Parts are joined in order, so the result equals the sequential one.
+    By default the number of chunks is the number of processors
+    """
+    n = len(fi)
+    chunks = chunks or os.cpu_count() or 1
+    if chunks < 1:
+        raise ValueError(f'number of chunks must be positive, got {chunks}')
+
+    if n < 2 or chunks == 1:
+        return find_windows(fi, arc, align)
+
+    afterlast0 = int(sweep_limits(fi, arc, [0])[0])
+    bounds = np.linspace(0, n, min(chunks, n) + 1).astype(int).tolist()
+    memory, shared = _shared_array((n,))
+    try:
+        shared[:] = fi
+        del shared
+        with ProcessPoolExecutor(max_workers, initializer=_attach, initargs=(memory.name, (n,))) as executor:
+            futures = [executor.submit(_sweep_chunk, arc, lo, hi, afterlast0) for lo, hi in zip(bounds, bounds[1:])]
+            first, afterlast, start = join_windows(fi, afterlast0, (future.result() for future in futures))
+    finally:
+        memory.close()
+        memory.unlink()
+
+    if align:
+        start = align_windows(fi, arc, first, afterlast, start, one_deg, two_deg)
+
+    return first, afterlast, start
+
+
+def find_group_set_parallel(sector: SectorBase, points: Union[PointGrid, Cloud], /,
+                            align: bool = False, *,
+                            weights: Iterable[Real] = None,
+                            chunks: int = None,
+                            max_workers: int = None) -> GroupSet:
+    """
+    Finds all groups like find_group_set running the sweep in a process pool, see parallel_windows
+    """
+    check_arc(sector.arc)
+    arc = float(sector.arc)
+    prepared = PreparedPoints(sector.circle, points, weights)
+    windows = parallel_windows(prepared.angles, arc, align, chunks=chunks, max_workers=max_workers)
+    return GroupSet(prepared, arc, *windows)
@@ -0,0 +1,40 @@
+"""
+Compares circle queries through PointGrid with full scans of a PointArray.
+Run from the code directory: python -m benchmarks.grid
+"""
+from math import pi, sqrt
+from timeit import Timer
+
+import numpy as np
+
+from geometry import Cartesian, CartesianArray, Circle, PointGrid
+
+
+def measure(statement, /) -> float:
+    """
+    Returns the best time of a call in seconds
+    """
+    timer = Timer(statement)
+    number, _ = timer.autorange()
+    return min(timer.repeat(5, number)) / number
+
+
+def main(n: int = 1_000_000, seed: int = 0, /):
+    rng = np.random.default_rng(seed)
+    array = CartesianArray(rng.uniform(0, 1, n), rng.uniform(0, 1, n))
+
+    build = measure(lambda: PointGrid(array))
+    grid = PointGrid(array)
+    print(f'{n} points, grid {grid.shape[0]}x{grid.shape[1]} built in {build * 1e3:.1f} ms')
+    print(f'{"in range":>10} {"grid, µs":>10} {"scan, µs":>10} {"grid per point, ns":>20}')
+
+    for expected in (10, 100, 1_000, 10_000, 100_000):
+        circle = Circle(Cartesian(0.5, 0.5), sqrt(expected / n / pi))
+        inside = len(circle.indices_of_points_inside(grid))
+        grid_time = measure(lambda: circle.indices_of_points_inside(grid))
+        scan_time = measure(lambda: circle.indices_of_points_inside(array))
+        print(f'{inside:>10} {grid_time * 1e6:>10.1f} {scan_time * 1e6:>10.1f} {grid_time / inside * 1e9:>20.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+"""
+Measures time and peak memory of find_all_groups on seeded synthetic workloads.
+Every measurement is printed as a JSON line, see Result.
+Groups of wide arcs contain a fixed share of points, so enumerating them takes quadratic time.
+Larger sizes of a workload are skipped once a run exceeds --max-seconds,
+the group-set engine finds the same groups in compact form and scales up to 10^6 points.
+Run from the code directory: python -m benchmarks.groups [--sizes 100 1000] [--output results.jsonl]
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import tracemalloc
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import asdict, dataclass
+from math import pi, tau
+from time import perf_counter
+from typing import Optional, Union
+
+import numpy as np
+
+from algorithm import find_all_groups, find_group_set
+from geometry import Cartesian, CartesianArray, Circle, Sector
+from geometry.point import PointArray, PointBase
+
+# All workloads are inside the unit circle centered at the origin
+CIRCLE = Circle(Cartesian(0, 0), 1)
+
+
+def uniform_disc(n: int, rng: np.random.Generator, /) -> tuple[np.ndarray, np.ndarray]:
+    r = np.sqrt(rng.uniform(0, 1, n))
+    fi = rng.uniform(-pi, pi, n)
+    return r * np.cos(fi), r * np.sin(fi)
+
+
+def angular_clusters(n: int, rng: np.random.Generator, /, clusters: int = 8, spread: float = 1e-3
+                     ) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Points around a few directions within spread radians
+    """
+    centers = rng.uniform(-pi, pi, clusters)
+    fi = centers[rng.integers(0, clusters, n)] + rng.normal(0, spread, n)
+    r = np.sqrt(rng.uniform(0, 1, n))
+    return r * np.cos(fi), r * np.sin(fi)
+
+
+def collinear_duplicates(n: int, rng: np.random.Generator, /, rays: int = 16) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Points on a few rays with integer directions, many points share an angle and many coincide.
+    Coordinates are multiples of a power of 2, so points on a ray have exactly the same angle
+    """
+    directions = rng.integers(-4, 5, (rays, 2))
+    directions[(directions == 0).all(axis=1)] = 1
+    steps = rng.integers(1, max(n // (4 * rays), 2), n)
+    ray = rng.integers(0, rays, n)
+    scale = 2. ** -np.ceil(np.log2(np.hypot(*directions.T).max() * steps.max() + 1))
+    return directions[ray, 0] * steps * scale, directions[ray, 1] * steps * scale
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    generate: Callable[[int, np.random.Generator], tuple[np.ndarray, np.ndarray]]
+    arc: float
+
+
+SCENARIOS = (
+    Scenario('uniform', uniform_disc, pi / 3),
+    Scenario('clusters', angular_clusters, pi / 3),
+    Scenario('collinear', collinear_duplicates, pi / 3),
+    Scenario('full-arc', uniform_disc, tau - 1e-9),
+    Scenario('tiny-arc', uniform_disc, 1e-6),
+)
+
+
+@dataclass(frozen=True)
+class Result:
+    scenario: str
+    n: int
+    align: bool
+    engine: str
+    arc: float
+    seed: int
+    points_inside: Optional[int] = None
+    groups: Optional[int] = None
+    seconds: Optional[float] = None
+    peak_bytes: Optional[int] = None
+    skipped: bool = False
+
+
+def make_points(x: np.ndarray, y: np.ndarray, /, array: bool = False) -> Union[PointArray, list[PointBase]]:
+    if array:
+        return CartesianArray(x, y)
+
+    return [Cartesian(a, b) for a, b in zip(x.tolist(), y.tolist())]
+
+
+ENGINES = 'reference', 'vectorized', 'group-set'
+
+
+def run(sector: Sector, points, /, align: bool, engine: str) -> int:
+    """
+    Consumes all groups without keeping them and returns their number
+    """
+    if engine == 'group-set':
+        return len(find_group_set(sector, points, align))
+
+    count = 0
+    for _ in find_all_groups(sector, points, align, vectorized=engine == 'vectorized'):
+        count += 1
+
+    return count
+
+
+def measure(scenario: Scenario, n: int, seed: int, /, align: bool, engine: str, array: bool, repeat: int
+            ) -> Result:
+    x, y = scenario.generate(n, np.random.default_rng(seed))
+    points = make_points(x, y, array)
+    sector = Sector(CIRCLE, scenario.arc, 0)
+
+    seconds = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = perf_counter()
+        groups = run(sector, points, align, engine)
+        seconds = min(seconds, perf_counter() - start)
+
+    # Tracing slows allocations down, so memory is measured in a separate run
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run(sector, points, align, engine)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Result(
+        scenario.name,
+        n,
+        align,
+        engine,
+        scenario.arc,
+        seed,
+        len(CIRCLE.indices_of_points_inside(CartesianArray(x, y))),
+        groups,
+        seconds,
+        peak,
+    )
+
+
+def benchmark(sizes: Iterable[int], scenarios: Iterable[Scenario], /, seed: int = 0, *,
+              engine: str = 'reference',
+              array: bool = False,
+              repeat: int = 1,
+              max_seconds: float = float('inf')) -> Iterator[Result]:
+    sizes = sorted(sizes)
+    for scenario in scenarios:
+        for align in (False, True):
+            slow = False
+            for n in sizes:
+                if slow:
+                    yield Result(scenario.name, n, align, engine, scenario.arc, seed, skipped=True)
+                    continue
+
+                result = measure(scenario, n, seed, align, engine, array, repeat)
+                slow = result.seconds > max_seconds
+                yield result
+
+
+def main(argv: list[str] = None, /):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10 ** k for k in range(2, 7)])
+    parser.add_argument('--scenarios', nargs='+', choices=[s.name for s in SCENARIOS],
+                        default=[s.name for s in SCENARIOS])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1, help='best of this number of runs is reported')
+    parser.add_argument('--engine', choices=ENGINES, default=ENGINES[0],
+                        help='sweep of find_all_groups or find_group_set')
+    parser.add_argument('--array', action='store_true', help='pass points as a PointArray')
+    parser.add_argument('--max-seconds', type=float, default=10.,
+                        help='larger sizes are skipped after a slower run')
+    parser.add_argument('--output', help='file to write JSON lines to, standard output by default')
+    args = parser.parse_args(argv)
+
+    scenarios = [s for s in SCENARIOS if s.name in args.scenarios]
+    out = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        # The first line describes the environment
+        meta = dict(python=platform.python_version(), numpy=np.__version__, machine=platform.machine())
+        print(json.dumps(meta), file=out, flush=True)
+        for result in benchmark(args.sizes, scenarios, args.seed,
+                                engine=args.engine, array=args.array, repeat=args.repeat,
+                                max_seconds=args.max_seconds):
+            print(json.dumps(asdict(result)), file=out, flush=True)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
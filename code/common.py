@@ -1,6 +1,8 @@
-from math import ceil, degrees, floor, pi, radians
+from math import ceil, degrees, pi, radians
 from typing import Union
 
+import numpy as np
+
 real = int, float
 Real = Union[int, float]
 
@@ -18,9 +20,40 @@ def reduce_angle(angle: Real) -> float:
     if -PI < angle <= PI:
         return angle
 
-    n = angle / TWOPI
-    n = ceil(n) if n < 0 else floor(n)
-    return angle - n * TWOPI
+    return angle - ceil((angle - PI) / TWOPI) * TWOPI
+
+
+def reduce_angles(angles: np.ndarray, /) -> np.ndarray:
+    """
+    Move angles in radians to range (-π, π]
+    """
+    angles = np.asarray(angles, dtype=float)
+    inside = (-PI < angles) & (angles <= PI)
+    return np.where(inside, angles, angles - np.ceil((angles - PI) / TWOPI) * TWOPI)
+
+
+MASK64 = (1 << 64) - 1
+
+
+def mix64(value: int, /) -> int:
+    """
+    Scrambles bits of a 64-bit integer (SplitMix64 finalizer).
+    Used to make keys of points for XOR fingerprints
+    """
+    z = (value + 0x9E3779B97F4A7C15) & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+
+def mix64s(values: np.ndarray, /) -> np.ndarray:
+    """
+    Scrambles bits of 64-bit integers, results are the same as of mix64
+    """
+    z = np.asarray(values, dtype=np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
 
 
-__all__ = 'real', 'Real', 'PI', 'TWOPI', 'deg', 'rad', 'reduce_angle'
+__all__ = 'real', 'Real', 'PI', 'TWOPI', 'deg', 'rad', 'reduce_angle', 'reduce_angles', 'mix64', 'mix64s'
@@ -1,5 +1,8 @@
 from collections.abc import Collection, Iterable, Iterator, Sequence
-from typing import Any, Generic, TypeVar, overload
+from itertools import islice
+from typing import Any, Generic, Optional, TypeVar, overload
+
+from views import CyclicView
 
 T = TypeVar('T')
 S = TypeVar('S', bound=Sequence)
@@ -53,6 +56,26 @@ class CyclicSequence(Generic[T]):
         if len(self) == 0:
             raise IndexError(f'{self.__class__.__name__} is empty')
 
+    def view(self, start: int = 0, stop: Optional[int] = None, /) -> CyclicView[T]:
+        """
+        Returns a view of items from start to stop like self[start:stop] without copying them
+        """
+        self._check_emptiness()
+
+        if stop is None:
+            stop = len(self)
+
+        return CyclicView(self, self._convert_index(start), max(0, min(stop - start, len(self))), super().__getitem__)
+
+    def _slice_view(self, s: slice, /) -> Optional[CyclicView[T]]:
+        """
+        Returns a view of a slice with step 1, None for other steps
+        """
+        if _get_slice_value(s.step, 1) != 1:
+            return None
+
+        return self.view(_get_slice_value(s.start, 0), _get_slice_value(s.stop, len(self)))
+
     @overload
     def __getitem__(self, index: int, /) -> T: ...
 
@@ -66,6 +89,11 @@ class CyclicSequence(Generic[T]):
             return super().__getitem__(self._convert_index(item))
 
         if isinstance(item, slice):
+            if (view := self._slice_view(item)) is not None:
+                # Contiguous segments are copied at once
+                # noinspection PyArgumentList
+                return self.__class__(view.to_list())
+
             getitem = super().__getitem__
             # noinspection PyArgumentList
             return self.__class__(getitem(i) for i in self._slice_indices(item))
@@ -102,8 +130,20 @@ class MutableCyclicSequence(CyclicSequence[T]):
         if isinstance(item, int):
             super().__setitem__(self._convert_index(item), value)
         elif isinstance(item, slice):
-            indices = tuple(self._slice_indices(item))
             setitem = super().__setitem__
+            if (view := self._slice_view(item)) is not None:
+                # A copy of values also protects from assigning a part of self
+                value = tuple(value)
+                if len(view) != len(value):
+                    raise ValueError(f'slice and value have different lengths, {len(view)} and {len(value)}')
+
+                values = iter(value)
+                for a, b in view.segments:
+                    setitem(slice(a, b), islice(values, b - a))
+
+                return
+
+            indices = tuple(self._slice_indices(item))
             if not isinstance(value, Collection):
                 value = tuple(value)
 
@@ -128,15 +168,42 @@ class MutableCyclicSequence(CyclicSequence[T]):
         if isinstance(item, int):
             super().__delitem__(self._convert_index(item))
         elif isinstance(item, slice):
+            if (view := self._slice_view(item)) is not None:
+                delitem = super().__delitem__
+                # The segment at the end goes first, so bounds of the other one stay valid
+                for a, b in sorted(view.segments, reverse=True):
+                    delitem(slice(a, b))
+
+                return
+
             indices = set(self._slice_indices(item))
-            delitem = super().__delitem__
-            for i in range(len(self) - 1, -1, -1):
-                if i not in indices:
-                    delitem(i)
+            getitem = super().__getitem__
+            super().__setitem__(slice(None), [getitem(i) for i in range(len(self)) if i not in indices])
         else:
             raise TypeError(f'{self.__class__.__name__} indices must be integers or slices, '
                             f'not {item.__class__.__name__}')
 
+    def rotate(self, steps: int = 1, /):
+        """
+        Rotates items steps to the right like deque.rotate, to the left if steps is negative.
+        Only the shorter part of the sequence is copied, the rest is moved at once
+        """
+        n = len(self)
+        if n == 0 or (steps := steps % n) == 0:
+            return
+
+        getitem = super().__getitem__
+        setitem = super().__setitem__
+        delitem = super().__delitem__
+        if steps <= n // 2:
+            tail = getitem(slice(n - steps, n))
+            delitem(slice(n - steps, n))
+            setitem(slice(0, 0), tail)
+        else:
+            head = getitem(slice(0, n - steps))
+            delitem(slice(0, n - steps))
+            setitem(slice(steps, steps), head)
+
 
 class CyclicTuple(CyclicSequence, tuple):
     __slots__ = ()
@@ -47,5 +47,11 @@ def bezier(t: Real, /, *values: Union[Real, PointBase]) -> Union[Real, PointBase
 
 
 def qbezeir_svg_given_middle(p0: PointBase, p2: PointBase, pm: PointBase, /) -> str:
-    p1 = (pm - p0 / 4 - p2 / 4) * 2
-    return f'Q {p1.x} {p1.y} {p2.x} {p2.y}'
+    return qbezeir_svg_given_middle_xy(p0.x, p0.y, p2.x, p2.y, pm.x, pm.y)
+
+
+def qbezeir_svg_given_middle_xy(x0: Real, y0: Real, x2: Real, y2: Real, xm: Real, ym: Real, /) -> str:
+    """
+    Same as qbezeir_svg_given_middle for coordinates of points, so points do not have to be created
+    """
+    return f'Q {(xm - x0 / 4 - x2 / 4) * 2} {(ym - y0 / 4 - y2 / 4) * 2} {x2} {y2}'
@@ -1,5 +1,10 @@
 from .circle import Circle
-from .point import Cartesian, Polar
+from .files import iter_points, load_points
+from .grid import PointGrid
+from .point import Cartesian, CartesianArray, Polar, PolarArray
 from .sector import Sector
 
-__all__ = 'Circle', 'Cartesian', 'Polar', 'Sector'
+__all__ = (
+    'Circle', 'Cartesian', 'CartesianArray', 'PointGrid', 'Polar', 'PolarArray', 'Sector',
+    'iter_points', 'load_points',
+)
@@ -1,5 +1,10 @@
+from typing import overload
+
+import numpy as np
+
 from common import Real
-from .point import FixedPoint, PointBase
+from .grid import PointGrid
+from .point import FixedPoint, PointArray, PointBase, relative_r2, xy_columns
 
 
 def check_radius(value: float, /):
@@ -64,6 +69,52 @@ class CircleBase:
 
         return False
 
+    @overload
+    def are_points_inside(self, points: PointArray, /) -> np.ndarray: ...
+
+    @overload
+    def are_points_inside(self, x: np.ndarray, y: np.ndarray, /) -> np.ndarray: ...
+
+    def are_points_inside(self, points, y=None, /):
+        """
+        Returns boolean mask of points inside the circle
+        """
+        return relative_r2(PointArray(*xy_columns(points, y)), self.center) <= self.r2
+
+    @overload
+    def indices_of_points_inside(self, points: PointArray, /) -> np.ndarray: ...
+
+    @overload
+    def indices_of_points_inside(self, grid: PointGrid, /) -> np.ndarray: ...
+
+    @overload
+    def indices_of_points_inside(self, x: np.ndarray, y: np.ndarray, /) -> np.ndarray: ...
+
+    def indices_of_points_inside(self, points, y=None, /):
+        """
+        Returns sorted indexes of points inside the circle.
+        If a PointGrid is passed, only points inside cells covering the circle are tested
+        """
+        if isinstance(points, PointGrid):
+            if y is not None:
+                raise TypeError('y coordinates cannot be passed along with a PointGrid')
+
+            indices = self.indices_of_candidates(points)
+            array = points.array
+            return indices[self.are_points_inside(array.x[indices], array.y[indices])]
+
+        return np.flatnonzero(self.are_points_inside(points, y))
+
+    def indices_of_candidates(self, grid: PointGrid, /) -> np.ndarray:
+        """
+        Returns sorted indexes of points inside cells covering the circle
+        """
+        c = self.center
+        r = self.radius
+        # Pad the box by a few ulps, so rounding errors cannot drop points on the boundary
+        pad = 4 * float(np.spacing(max(abs(c.x), abs(c.y)) + r))
+        return grid.indices_in_box(c.x - r - pad, c.y - r - pad, c.x + r + pad, c.y + r + pad)
+
     def as_plotly_shape(self, /) -> dict:
         r = self.radius
         c = self.center
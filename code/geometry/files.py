@@ -0,0 +1,169 @@
+import os
+from collections.abc import Iterable, Iterator
+from typing import Literal, Optional, Union
+
+import numpy as np
+
+from .point import PointArray, check_weights
+
+Path = Union[str, os.PathLike]
+Layout = Literal['rows', 'columns']
+Names = Union[Path, np.ndarray, Iterable[str], None]
+
+
+def _check_layout(layout: str, /):
+    if layout not in ('rows', 'columns'):
+        raise ValueError(f'layout must be rows or columns, got {layout!r}')
+
+
+def _open(path: Path, dtype: np.dtype, layout: Layout, offset: int, /
+          ) -> tuple[np.ndarray, np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+    """
+    Memory-maps a file and returns views of x, y, names and weights columns.
+    A .npy file holds either an array of shape (n, 2) or a structured array with fields x, y
+    and optional fields name and weight.
+    Other files are raw coordinates of the given type, pairs of x and y in rows layout
+    or all x followed by all y in columns layout
+    """
+    _check_layout(layout)
+    if os.fspath(path).endswith('.npy'):
+        data = np.load(path, mmap_mode='r')
+        if data.dtype.names is not None:
+            missing = {'x', 'y'}.difference(data.dtype.names)
+            if missing:
+                raise ValueError(f'structured array in {path} has no fields {", ".join(sorted(missing))}')
+
+            names = data['name'] if 'name' in data.dtype.names else None
+            weights = data['weight'] if 'weight' in data.dtype.names else None
+            return data['x'], data['y'], names, weights
+
+        if data.ndim != 2 or data.shape[1] != 2:
+            raise ValueError(f'array in {path} must have shape (n, 2), got {data.shape}')
+
+        return data[:, 0], data[:, 1], None, None
+
+    dtype = np.dtype(dtype)
+    size = os.path.getsize(path) - offset
+    if size % (2 * dtype.itemsize) != 0:
+        raise ValueError(f'size of {path} is not a multiple of the size of a point')
+
+    n = size // (2 * dtype.itemsize)
+    if n == 0:
+        empty = np.empty(0, dtype=dtype)
+        return empty, empty, None, None
+
+    if layout == 'rows':
+        data = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(n, 2))
+        return data[:, 0], data[:, 1], None, None
+
+    data = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(2, n))
+    return data[0], data[1], None, None
+
+
+def _load_names(names: Names, n: int, /) -> Optional[np.ndarray]:
+    if names is None:
+        return None
+
+    if isinstance(names, (str, os.PathLike)):
+        names = np.load(names, mmap_mode='r')
+    elif not isinstance(names, np.ndarray):
+        names = np.array(list(names), dtype=str)
+
+    if names.shape != (n,):
+        raise ValueError(f'number of names must be equal to number of points, got {names.shape} and {n}')
+
+    return names
+
+
+def check_names(names: np.ndarray, /, chunk_size: int = 1 << 16):
+    """
+    Checks names of points like check_name without creating a string for every name.
+    Names are checked in chunks of chunk_size names to limit memory used by character codes
+    """
+    if names.dtype.kind == 'S':
+        code = np.uint8
+    elif names.dtype.kind == 'U':
+        code = np.uint32
+    else:
+        raise TypeError(f'names of points must be strings, got array of {names.dtype}')
+
+    width = names.dtype.itemsize // np.dtype(code).itemsize
+    for start in range(0, len(names), chunk_size):
+        chunk = np.ascontiguousarray(names[start:start + chunk_size])
+        if width == 0:
+            raise ValueError('name of a point cannot be empty')
+
+        codes = chunk.view(code).reshape(len(chunk), width)
+        upper = (codes >= ord('A')) & (codes <= ord('Z'))
+        digit = (codes >= ord('0')) & (codes <= ord('9'))
+        # Shorter names are padded with zeros
+        padding = np.logical_and.accumulate(codes[:, ::-1] == 0, axis=1)[:, ::-1]
+        bad = ~upper[:, 0] | ~(upper | digit | padding).all(axis=1)
+        if bad.any():
+            name = chunk[int(np.argmax(bad))]
+            name = name.decode('ascii', 'replace') if isinstance(name, bytes) else str(name)
+
+            raise ValueError(f'name of a point must start with upper latin letter '
+                             f'and contain only upper latin letters and digits, got {name!r}')
+
+
+def _point_array(x: np.ndarray, y: np.ndarray, names: Optional[np.ndarray], weights: Optional[np.ndarray], /
+                 ) -> PointArray:
+    """
+    Creates a PointArray over columns, columns are copied only if they are not float64 or names are bytes
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if names is not None:
+        check_names(names)
+        if names.dtype.kind == 'S':
+            names = names.astype(str)
+
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float)
+        check_weights(weights, len(x))
+
+    for a in (x, y, names, weights):
+        if a is not None and a.flags.writeable:
+            a.flags.writeable = False
+
+    return PointArray(x, y, names, weights)
+
+
+def load_points(path: Path, /, names: Names = None, *,
+                dtype: np.dtype = np.float64,
+                layout: Layout = 'rows',
+                offset: int = 0) -> PointArray:
+    """
+    Memory-maps a binary or .npy file of coordinates into a PointArray without creating point objects.
+    Names are taken from a name field of a structured .npy file, a .npy file of strings or an array.
+    Columns of float64 are used without copying, so pages of the file are read only when accessed.
+    Names and weights are validated on load
+    """
+    x, y, field_names, weights = _open(path, dtype, layout, offset)
+    return _point_array(x, y, field_names if names is None else _load_names(names, len(x)), weights)
+
+
+def iter_points(path: Path, /, chunk_size: int = 1 << 20, names: Names = None, *,
+                dtype: np.dtype = np.float64,
+                layout: Layout = 'rows',
+                offset: int = 0) -> Iterator[PointArray]:
+    """
+    Memory-maps a file like load_points and yields consecutive PointArray chunks of chunk_size points.
+    Every chunk is copied into memory and validated separately, so files larger than memory can be processed
+    """
+    if chunk_size < 1:
+        raise ValueError(f'chunk size must be positive, got {chunk_size}')
+
+    x, y, field_names, weights = _open(path, dtype, layout, offset)
+    if names is not None:
+        field_names = _load_names(names, len(x))
+
+    for start in range(0, len(x), chunk_size):
+        stop = start + chunk_size
+        yield _point_array(
+            np.array(x[start:stop], dtype=float),
+            np.array(y[start:stop], dtype=float),
+            None if field_names is None else np.array(field_names[start:stop]),
+            None if weights is None else np.array(weights[start:stop], dtype=float),
+        )
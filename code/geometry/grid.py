@@ -0,0 +1,142 @@
+from collections.abc import Iterable
+from math import sqrt
+from typing import Optional, Union, final
+
+import numpy as np
+
+from common import Real
+from .point import PointArray, PointBase, point_columns
+
+
+def check_cell_size(value: float, /):
+    if not value > 0:
+        raise ValueError(f'cell size must be positive, got {value}')
+
+
+def ranges(lo: np.ndarray, hi: np.ndarray, /) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Concatenates ranges [lo[i], hi[i]).
+    Returns values of ranges and indexes of ranges these values belong to
+    """
+    counts = hi - lo
+    owners = np.repeat(np.arange(len(counts)), counts)
+    ends = np.cumsum(counts)
+    values = np.arange(len(owners)) + np.repeat(lo - ends + counts, counts)
+    return values, owners
+
+
+@final
+class PointGrid:
+    """
+    Uniform grid over points built once to query points inside many boxes and circles.
+    Points of every cell are stored contiguously, cells are ordered by rows.
+    Query cost is proportional to the number of rows and points inside covered cells
+    """
+    __slots__ = '_points', '_array', '_x0', '_y0', '_size', '_nx', '_ny', '_order', '_starts'
+
+    def __init__(self, points: Union[PointArray, Iterable[PointBase]], /, cell_size: Optional[Real] = None):
+        points, array = point_columns(points)
+        x, y = array.x, array.y
+        n = len(x)
+        x0, x1 = (float(x.min()), float(x.max())) if n else (0., 0.)
+        y0, y1 = (float(y.min()), float(y.max())) if n else (0., 0.)
+        width = x1 - x0
+        height = y1 - y0
+
+        # By default a cell contains a point on average
+        if cell_size is None:
+            cell_size = sqrt(width * height / n) if width * height > 0 else max(width, height) / max(n, 1)
+            cell_size = cell_size or 1.
+        else:
+            check_cell_size(cell_size)
+
+        # Do not allocate much more cells than points
+        cell_size = float(cell_size)
+        while (width / cell_size + 1) * (height / cell_size + 1) > 4 * n + 4:
+            cell_size *= 2
+
+        self._points = points
+        self._array = array
+        self._x0 = x0
+        self._y0 = y0
+        self._size = cell_size
+        self._nx = int(width // cell_size) + 1
+        self._ny = int(height // cell_size) + 1
+
+        cells = self._columns(x) + self._rows(y) * self._nx
+        self._order = np.argsort(cells, kind='stable')
+        self._starts = np.searchsorted(cells[self._order], np.arange(self._nx * self._ny + 1))
+        self._order.flags.writeable = False
+        self._starts.flags.writeable = False
+
+    @property
+    def points(self, /) -> Union[PointArray, list[PointBase]]:
+        return self._points
+
+    @property
+    def array(self, /) -> PointArray:
+        return self._array
+
+    @property
+    def cell_size(self, /) -> float:
+        return self._size
+
+    @property
+    def shape(self, /) -> tuple[int, int]:
+        """
+        Number of columns and rows
+        """
+        return self._nx, self._ny
+
+    def __len__(self, /):
+        return len(self._order)
+
+    def __repr__(self, /):
+        return f'{self.__class__.__name__}({len(self)} points, {self._nx}x{self._ny} cells of {self._size:.2g})'
+
+    def _columns(self, x: np.ndarray, /) -> np.ndarray:
+        return np.clip(np.floor((x - self._x0) / self._size), 0, self._nx - 1).astype(np.intp)
+
+    def _rows(self, y: np.ndarray, /) -> np.ndarray:
+        return np.clip(np.floor((y - self._y0) / self._size), 0, self._ny - 1).astype(np.intp)
+
+    def ranges_in_boxes(self, x0: np.ndarray, y0: np.ndarray, x1: np.ndarray, y1: np.ndarray, /
+                        ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns ranges of positions in the grid order covering boxes [x0, x1] × [y0, y1].
+        Every range is a row of cells inside one box, ranges are returned with indexes of their boxes.
+        Ranges of one box are consecutive, boxes are in the given order
+        """
+        x0, y0, x1, y1 = np.broadcast_arrays(*(np.atleast_1d(np.asarray(a, dtype=float)) for a in (x0, y0, x1, y1)))
+        # Boxes outside the grid are empty
+        empty = (x1 < self._x0) | (y1 < self._y0) | (x0 > self._x0 + self._nx * self._size) | \
+                (y0 > self._y0 + self._ny * self._size) | (x1 < x0) | (y1 < y0)
+        c0 = self._columns(x0)
+        c1 = self._columns(x1)
+        r0 = self._rows(y0)
+        r1 = np.where(empty, r0 - 1, self._rows(y1))
+
+        rows, boxes = ranges(r0, r1 + 1)
+        cells = rows * self._nx
+        lo = self._starts[cells + c0[boxes]]
+        hi = self._starts[cells + c1[boxes] + 1]
+        return lo, hi, boxes
+
+    def indices_in_boxes(self, x0: np.ndarray, y0: np.ndarray, x1: np.ndarray, y1: np.ndarray, /
+                         ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns indexes of points inside cells covering boxes [x0, x1] × [y0, y1] with indexes of their boxes.
+        Points inside cells may be outside boxes
+        """
+        lo, hi, boxes = self.ranges_in_boxes(x0, y0, x1, y1)
+        positions, owners = ranges(lo, hi)
+        return self._order[positions], boxes[owners]
+
+    def indices_in_box(self, x0: Real, y0: Real, x1: Real, y1: Real, /) -> np.ndarray:
+        """
+        Returns sorted indexes of points inside cells covering box [x0, x1] × [y0, y1]
+        """
+        indices, _ = self.indices_in_boxes(x0, y0, x1, y1)
+        indices.sort()
+        return indices
+
@@ -1,5 +1,8 @@
-from math import atan2, cos, sin, sqrt
-from typing import Literal, Union, overload
+from collections.abc import Iterable, Iterator
+from math import atan2, cos, inf, nan, sin, sqrt
+from typing import Literal, Optional, Union, overload
+
+import numpy as np
 
 from common import Real, deg, real
 
@@ -182,11 +185,39 @@ class PointBase:
 
 
 class FixedPoint(PointBase):
-    __slots__ = '_hash',
+    __slots__ = '_hash', '_r2', '_r', '_fi'
 
     def __init__(self, x: float, y: float, /):
         super().__init__(x, y)
         self._hash = hash((x, y))
+        # Polar coordinates are computed on the first access
+        self._r2 = None
+        self._r = None
+        self._fi = None
+
+    @property
+    def r2(self, /) -> float:
+        r2 = self._r2
+        if r2 is None:
+            r2 = self._r2 = self._x * self._x + self._y * self._y
+
+        return r2
+
+    @property
+    def r(self, /) -> float:
+        r = self._r
+        if r is None:
+            r = self._r = sqrt(self.r2)
+
+        return r
+
+    @property
+    def fi(self, /) -> float:
+        fi = self._fi
+        if fi is None:
+            fi = self._fi = atan2(self._y, self._x)
+
+        return fi
 
     def fix(self, /):
         return self
@@ -199,27 +230,67 @@ class FixedPoint(PointBase):
 
 
 class MutablePoint(PointBase):
-    __slots__ = ()
+    __slots__ = '_r2', '_r', '_fi'
+
+    def __init__(self, x: float, y: float, /):
+        super().__init__(x, y)
+        self._clear()
+
+    def _clear(self, /):
+        """
+        Drops cached polar coordinates, must be called on every change of coordinates
+        """
+        self._r2 = None
+        self._r = None
+        self._fi = None
 
     @PointBase.x.setter
     def x(self, value: Real, /):
         self._x = float(value)
+        self._clear()
 
     @PointBase.y.setter
     def y(self, value: Real, /):
         self._y = float(value)
+        self._clear()
+
+    @property
+    def r2(self, /) -> float:
+        r2 = self._r2
+        if r2 is None:
+            r2 = self._r2 = self._x * self._x + self._y * self._y
 
-    @PointBase.r.setter
+        return r2
+
+    @property
+    def r(self, /) -> float:
+        r = self._r
+        if r is None:
+            r = self._r = sqrt(self.r2)
+
+        return r
+
+    @r.setter
     def r(self, r: Real, /):
         fi = self.fi
         self._x = r * cos(fi)
         self._y = r * sin(fi)
+        self._clear()
 
-    @PointBase.fi.setter
+    @property
+    def fi(self, /) -> float:
+        fi = self._fi
+        if fi is None:
+            fi = self._fi = atan2(self._y, self._x)
+
+        return fi
+
+    @fi.setter
     def fi(self, fi: Real, /):
         r = self.r
         self._x = r * cos(fi)
         self._y = r * sin(fi)
+        self._clear()
 
     def fix(self, /):
         return FixedPoint(self.x, self.y)
@@ -231,11 +302,13 @@ class MutablePoint(PointBase):
         if isinstance(other, real):
             self._x += other
             self._y += other
+            self._clear()
             return self
 
         if isinstance(other, PointBase):
             self._x += other.x
             self._y += other.y
+            self._clear()
             return self
 
         return NotImplemented
@@ -244,11 +317,13 @@ class MutablePoint(PointBase):
         if isinstance(other, real):
             self._x -= other
             self._y -= other
+            self._clear()
             return self
 
         if isinstance(other, PointBase):
             self._x -= other.x
             self._y -= other.y
+            self._clear()
             return self
 
         return NotImplemented
@@ -257,11 +332,13 @@ class MutablePoint(PointBase):
         if isinstance(other, real):
             self._x *= other
             self._y *= other
+            self._clear()
             return self
 
         if isinstance(other, PointBase):
             self._x *= other.x
             self._y *= other.y
+            self._clear()
             return self
 
         return NotImplemented
@@ -270,11 +347,13 @@ class MutablePoint(PointBase):
         if isinstance(other, real):
             self._x /= other
             self._y /= other
+            self._clear()
             return self
 
         if isinstance(other, PointBase):
             self._x /= other.x
             self._y /= other.y
+            self._clear()
             return self
 
         return NotImplemented
@@ -283,11 +362,13 @@ class MutablePoint(PointBase):
         if isinstance(other, real):
             self._x //= other
             self._y //= other
+            self._clear()
             return self
 
         if isinstance(other, PointBase):
             self._x //= other.x
             self._y //= other.y
+            self._clear()
             return self
 
         return NotImplemented
@@ -332,6 +413,336 @@ class NamedMutablePoint(NamedPointBase, MutablePoint):
     __slots__ = '_name',
 
 
+class PointView(PointBase):
+    """
+    Immutable point stored in a PointArray
+    """
+    __slots__ = '_array', '_index'
+
+    # noinspection PyMissingConstructor
+    def __init__(self, array: 'PointArray', index: int, /):
+        self._array = array
+        self._index = index
+
+    @property
+    def array(self, /) -> 'PointArray':
+        return self._array
+
+    @property
+    def index(self, /) -> int:
+        return self._index
+
+    @property
+    def x(self, /) -> float:
+        return float(self._array.x[self._index])
+
+    @property
+    def y(self, /) -> float:
+        return float(self._array.y[self._index])
+
+    @property
+    def weight(self, /) -> float:
+        """
+        Weight of the point, 1 if the array is not weighted
+        """
+        weights = self._array.weights
+        return 1. if weights is None else float(weights[self._index])
+
+    def _new_(self, x: float, y: float, /):
+        return FixedPoint(x, y)
+
+    def __getnewargs__(self, /):
+        return self._array, self._index
+
+    def fix(self, /):
+        return FixedPoint(self.x, self.y)
+
+    def unfix(self, /):
+        return MutablePoint(self.x, self.y)
+
+    def __hash__(self, /):
+        return hash((self.x, self.y))
+
+
+class NamedPointView(PointView, NamedPointBase):
+    __slots__ = ()
+
+    @property
+    def name(self, /) -> str:
+        return str(self._array.names[self._index])
+
+    def _new_(self, x: float, y: float, /):
+        return NamedFixedPoint(x, y, self.name)
+
+    def fix(self, /):
+        return NamedFixedPoint(self.x, self.y, self.name)
+
+    def unfix(self, /):
+        return NamedMutablePoint(self.x, self.y, self.name)
+
+
+class PointArray:
+    """
+    Immutable columnar storage of points.
+    Items are PointView instances, they are created on access
+    """
+    __slots__ = '_x', '_y', '_names', '_weights'
+
+    # Make numpy delegate operations with arrays to PointArray
+    __array_ufunc__ = None
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, names: Optional[np.ndarray] = None,
+                 weights: Optional[np.ndarray] = None, /):
+        self._x = x
+        self._y = y
+        self._names = names
+        self._weights = weights
+
+    @property
+    def x(self, /) -> np.ndarray:
+        return self._x
+
+    @property
+    def y(self, /) -> np.ndarray:
+        return self._y
+
+    @property
+    def names(self, /) -> Optional[np.ndarray]:
+        return self._names
+
+    @property
+    def weights(self, /) -> Optional[np.ndarray]:
+        return self._weights
+
+    @property
+    def r2(self, /) -> np.ndarray:
+        return self._x * self._x + self._y * self._y
+
+    @property
+    def r(self, /) -> np.ndarray:
+        return np.sqrt(self.r2)
+
+    @property
+    def fi(self, /) -> np.ndarray:
+        """
+        Angles computed by np.arctan2, see arctan2
+        """
+        return arctan2(self._y, self._x)
+
+    def __repr__(self, /):
+        named = '' if self._names is None else ', named'
+        weighted = '' if self._weights is None else ', weighted'
+        return f'{self.__class__.__name__}({len(self)} points{named}{weighted})'
+
+    def __getnewargs__(self, /):
+        return self._x, self._y, self._names, self._weights
+
+    def __len__(self, /):
+        return len(self._x)
+
+    def __iter__(self, /) -> Iterator[PointView]:
+        return map(self._view, range(len(self._x)))
+
+    def _view(self, index: int, /) -> PointView:
+        if self._names is None:
+            return PointView(self, index)
+
+        return NamedPointView(self, index)
+
+    def _new_(self, x: np.ndarray, y: np.ndarray, /):
+        return self.__class__(_readonly(x), _readonly(y), self._names, self._weights)
+
+    @overload
+    def __getitem__(self, index: int, /) -> PointView: ...
+
+    @overload
+    def __getitem__(self, indices: Union[slice, np.ndarray], /) -> 'PointArray': ...
+
+    def __getitem__(self, item, /):
+        if isinstance(item, (int, np.integer)):
+            n = len(self._x)
+            if not (-n <= item < n):
+                raise IndexError(f'{self.__class__.__name__} index out of range')
+
+            return self._view(int(item) % n)
+
+        names = None if self._names is None else self._names[item]
+        weights = None if self._weights is None else self._weights[item]
+        return self.__class__(
+            _readonly(self._x[item]),
+            _readonly(self._y[item]),
+            _readonly(names),
+            _readonly(weights),
+        )
+
+    def _other_xy(self, other, /):
+        if isinstance(other, real):
+            return other, other
+
+        if isinstance(other, PointBase):
+            return other.x, other.y
+
+        if isinstance(other, PointArray):
+            if len(other) != len(self):
+                raise ValueError(f'point arrays have different lengths, {len(self)} and {len(other)}')
+
+            return other._x, other._y
+
+        return None
+
+    def __neg__(self, /):
+        return self._new_(-self._x, -self._y)
+
+    def __pos__(self, /):
+        return self
+
+    def __add__(self, other, /):
+        if (xy := self._other_xy(other)) is None:
+            return NotImplemented
+
+        return self._new_(self._x + xy[0], self._y + xy[1])
+
+    def __radd__(self, other, /):
+        return self.__add__(other)
+
+    def __sub__(self, other, /):
+        if (xy := self._other_xy(other)) is None:
+            return NotImplemented
+
+        return self._new_(self._x - xy[0], self._y - xy[1])
+
+    def __rsub__(self, other, /):
+        if (xy := self._other_xy(other)) is None:
+            return NotImplemented
+
+        return self._new_(xy[0] - self._x, xy[1] - self._y)
+
+    def __mul__(self, other, /):
+        if (xy := self._other_xy(other)) is None:
+            return NotImplemented
+
+        return self._new_(self._x * xy[0], self._y * xy[1])
+
+    def __rmul__(self, other, /):
+        return self.__mul__(other)
+
+
+def _readonly(a: Optional[np.ndarray], /) -> Optional[np.ndarray]:
+    if a is not None:
+        a.flags.writeable = False
+
+    return a
+
+
+def xy_columns(points: Union[PointArray, np.ndarray], y: np.ndarray = None, /) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns x and y columns of a PointArray or of raw x and y arrays
+    """
+    if isinstance(points, PointArray):
+        if y is not None:
+            raise TypeError('y coordinates cannot be passed along with a PointArray')
+
+        return points.x, points.y
+
+    if y is None:
+        raise TypeError('y coordinates are required unless a PointArray is passed')
+
+    x = np.asarray(points, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if x.shape != y.shape:
+        raise ValueError(f'x and y must have the same shape, got {x.shape} and {y.shape}')
+
+    return x, y
+
+
+def point_columns(points: Union[PointArray, Iterable[PointBase]], /
+                  ) -> tuple[Union[PointArray, list[PointBase]], PointArray]:
+    """
+    Returns indexable points and their columns.
+    A PointArray is returned as is, other points are collected into a list
+    """
+    if isinstance(points, PointArray):
+        return points, points
+
+    points = list(points)
+    array = PointArray(
+        np.fromiter((p.x for p in points), float, len(points)),
+        np.fromiter((p.y for p in points), float, len(points)),
+    )
+    return points, array
+
+
+def arctan2(y: np.ndarray, x: np.ndarray, /, exact: bool = False) -> np.ndarray:
+    """
+    Element-wise atan2 of columns computed by np.arctan2, its results may differ from PointBase.fi in the last bit.
+    Exact results are computed by math.atan2 and are bit-identical to PointBase.fi, but it is much slower
+    """
+    if not exact:
+        return np.arctan2(y, x)
+
+    return np.fromiter(map(atan2, y.tolist(), x.tolist()), float, len(y))
+
+
+def relative_r2(points: Union[PointArray, Iterable[PointBase]], origin: PointBase, /) -> np.ndarray:
+    """
+    Returns squared distances from the origin to points, same as (p - origin).r2 without creating points
+    """
+    ox, oy = origin.x, origin.y
+    if isinstance(points, PointArray):
+        x = points.x - ox
+        y = points.y - oy
+        return x * x + y * y
+
+    r2 = []
+    for p in points:
+        x = p.x - ox
+        y = p.y - oy
+        r2.append(x * x + y * y)
+
+    return np.array(r2, dtype=float)
+
+
+def iter_relative_polar(points: Iterable[PointBase], origin: PointBase, /,
+                        max_r2: float = inf) -> Iterator[tuple[float, float]]:
+    """
+    Yields squared distances and angles of points relative to the origin in a single pass,
+    same as (p - origin).r2 and (p - origin).fi without creating points.
+    Angles of points farther than sqrt(max_r2) are not computed and are NaN
+    """
+    ox, oy = origin.x, origin.y
+    for p in points:
+        x = p.x - ox
+        y = p.y - oy
+        r2 = x * x + y * y
+        yield r2, atan2(y, x) if r2 <= max_r2 else nan
+
+
+def relative_polar(points: Union[PointArray, Iterable[PointBase]], origin: PointBase, /,
+                   max_r2: float = inf) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns squared distances and angles of points relative to the origin like iter_relative_polar.
+    Columns of a PointArray are transformed at once, their angles are computed by np.arctan2, see arctan2
+    """
+    if not isinstance(points, PointArray):
+        r2, fi = [], []
+        for p_r2, p_fi in iter_relative_polar(points, origin, max_r2):
+            r2.append(p_r2)
+            fi.append(p_fi)
+
+        return np.array(r2, dtype=float), np.array(fi, dtype=float)
+
+    x = points.x - origin.x
+    y = points.y - origin.y
+    r2 = x * x + y * y
+    if max_r2 == inf:
+        return r2, arctan2(y, x)
+
+    fi = np.full(len(r2), nan)
+    near = np.flatnonzero(r2 <= max_r2)
+    fi[near] = arctan2(y[near], x[near])
+    return r2, fi
+
+
 @overload
 def Cartesian(x: Real, y: Real, /) -> FixedPoint: ...
 
@@ -364,19 +775,24 @@ def Cartesian(x: Real, y: Real, name: str, /, *, fix: Literal[False]) -> NamedMu
 def Cartesian(x: Real, y: Real, name: str, /, *, fix: bool) -> Union[NamedFixedPoint, NamedMutablePoint]: ...
 
 
-def Cartesian(x: Real, y: Real, name: str = None, /, *, fix: bool = True) -> PointBase:
-    if isinstance(name, str):
-        if name == '':
-            raise ValueError('name of a point cannot be empty')
+def check_name(name: str, /):
+    if not isinstance(name, str):
+        raise TypeError(f'name of a point must be a string, got {type(name)}')
 
-        if not ('A' <= name[0] <= 'Z'):
-            raise ValueError(f'name of a point must start with upper latin letter, got {name!r}')
+    if name == '':
+        raise ValueError('name of a point cannot be empty')
 
-        for c in name:
-            if not ('A' <= c <= 'Z' or '0' <= c <= '9'):
-                raise ValueError(f'name of a point must contain only upper latin letters and digits, got {name!r}')
-    elif name is not None:
-        raise TypeError(f'name of a point must be a string, got {type(name)}')
+    if not ('A' <= name[0] <= 'Z'):
+        raise ValueError(f'name of a point must start with upper latin letter, got {name!r}')
+
+    for c in name:
+        if not ('A' <= c <= 'Z' or '0' <= c <= '9'):
+            raise ValueError(f'name of a point must contain only upper latin letters and digits, got {name!r}')
+
+
+def Cartesian(x: Real, y: Real, name: str = None, /, *, fix: bool = True) -> PointBase:
+    if name is not None:
+        check_name(name)
 
     x = float(x)
     y = float(y)
@@ -428,3 +844,75 @@ def Polar(r: Real, fi: Real, name: str, /, *, fix: bool) -> Union[NamedFixedPoin
 
 def Polar(r: Real, fi: Real, name: str = None, /, *, fix: bool = True) -> PointBase:
     return Cartesian(r * cos(fi), r * sin(fi), name, fix=fix)
+
+
+def _names_column(names: Optional[Iterable[str]], n: int, /) -> Optional[np.ndarray]:
+    if names is None:
+        return None
+
+    names = list(names)
+    if len(names) != n:
+        raise ValueError(f'number of names must be equal to number of points, got {len(names)} and {n}')
+
+    for name in names:
+        check_name(name)
+
+    return _readonly(np.array(names, dtype=str))
+
+
+def check_weights(weights: np.ndarray, n: int, /):
+    if weights.shape != (n,):
+        raise ValueError(f'number of weights must be equal to number of points, got {weights.shape} and {n}')
+    if not np.all(np.isfinite(weights) & (weights >= 0)):
+        raise ValueError('weights must be finite and non-negative')
+
+
+def weights_column(weights: Optional[Iterable[Real]], n: int, /) -> Optional[np.ndarray]:
+    """
+    Returns read-only column of weights checked to be finite and non-negative
+    """
+    if weights is None:
+        return None
+
+    if not isinstance(weights, (np.ndarray, list, tuple)):
+        weights = list(weights)
+
+    weights = np.array(weights, dtype=float)
+    check_weights(weights, n)
+    return _readonly(weights)
+
+
+def _column(values: Iterable[Real], /) -> np.ndarray:
+    if not isinstance(values, (np.ndarray, list, tuple)):
+        values = list(values)
+
+    a = np.array(values, dtype=float)
+    if a.ndim != 1:
+        raise ValueError(f'coordinates must be 1-dimensional, got {a.ndim} dimensions')
+
+    return a
+
+
+def CartesianArray(x: Iterable[Real], y: Iterable[Real], names: Iterable[str] = None,
+                   weights: Iterable[Real] = None, /) -> PointArray:
+    x = _column(x)
+    y = _column(y)
+    if len(x) != len(y):
+        raise ValueError(f'x and y must have the same length, got {len(x)} and {len(y)}')
+
+    return PointArray(_readonly(x), _readonly(y), _names_column(names, len(x)), weights_column(weights, len(x)))
+
+
+def PolarArray(r: Iterable[Real], fi: Iterable[Real], names: Iterable[str] = None,
+               weights: Iterable[Real] = None, /) -> PointArray:
+    r = _column(r)
+    fi = _column(fi)
+    if len(r) != len(fi):
+        raise ValueError(f'r and fi must have the same length, got {len(r)} and {len(fi)}')
+
+    return PointArray(
+        _readonly(r * np.cos(fi)),
+        _readonly(r * np.sin(fi)),
+        _names_column(names, len(r)),
+        weights_column(weights, len(r)),
+    )
@@ -1,11 +1,14 @@
 from io import StringIO
-from math import atan2, ceil
+from math import atan2, ceil, cos, sin
 from typing import Literal, Union, overload
 
-from common import PI, Real, TWOPI, deg, real, reduce_angle
-from functions import qbezeir_svg_given_middle
+import numpy as np
+
+from common import PI, Real, TWOPI, deg, real, reduce_angle, reduce_angles
+from functions import qbezeir_svg_given_middle_xy
 from .circle import CircleBase, FixedCircle
-from .point import PointBase, Polar
+from .grid import PointGrid
+from .point import PointArray, PointBase, relative_polar, xy_columns
 
 
 def check_arc(value: float, /):
@@ -105,28 +108,87 @@ class SectorBase:
 
         return False
 
+    def are_angles_inside(self, fi: np.ndarray, /) -> np.ndarray:
+        """
+        Returns boolean mask of angles inside the sector
+        """
+        fi = reduce_angles(fi)
+        start = self.start_arm
+        end = self.end_arm_reduced
+        if end > start:
+            return ((end <= fi) & (fi <= PI)) | ((-PI < fi) & (fi <= start))
+
+        return (end <= fi) & (fi <= start)
+
+    @overload
+    def are_points_inside(self, points: PointArray, /) -> np.ndarray: ...
+
+    @overload
+    def are_points_inside(self, x: np.ndarray, y: np.ndarray, /) -> np.ndarray: ...
+
+    def are_points_inside(self, points, y=None, /):
+        """
+        Returns boolean mask of points inside the sector.
+        Angles are computed only for points inside the circle
+        """
+        r2, fi = relative_polar(PointArray(*xy_columns(points, y)), self.circle.center, self.circle.r2)
+        mask = r2 <= self.circle.r2
+        candidates = np.flatnonzero(mask & (r2 != 0))
+        mask[candidates] = self.are_angles_inside(fi[candidates])
+        return mask
+
+    @overload
+    def indices_of_points_inside(self, points: PointArray, /) -> np.ndarray: ...
+
+    @overload
+    def indices_of_points_inside(self, grid: PointGrid, /) -> np.ndarray: ...
+
+    @overload
+    def indices_of_points_inside(self, x: np.ndarray, y: np.ndarray, /) -> np.ndarray: ...
+
+    def indices_of_points_inside(self, points, y=None, /):
+        """
+        Returns sorted indexes of points inside the sector.
+        If a PointGrid is passed, only points inside cells covering the circle are tested
+        """
+        if isinstance(points, PointGrid):
+            if y is not None:
+                raise TypeError('y coordinates cannot be passed along with a PointGrid')
+
+            indices = self.circle.indices_of_candidates(points)
+            array = points.array
+            return indices[self.are_points_inside(array.x[indices], array.y[indices])]
+
+        return np.flatnonzero(self.are_points_inside(points, y))
+
     def as_plotly_shape(self, step_angle: Real = PI / 6, /) -> dict:
         # Simulate circle arc with quadratic Bezier curves
-        center = self.circle.center
+        cx = self.circle.center.x
+        cy = self.circle.center.y
         r = self.circle.radius
+
+        # Points on the circle are computed as coordinates, not as points
+        def at(angle: float, /) -> tuple[float, float]:
+            return r * cos(angle) + cx, r * sin(angle) + cy
+
         n = ceil(self.arc / step_angle) - 1
-        p0 = Polar(r, self.start_arm) + center
+        x0, y0 = at(self.start_arm)
         path = StringIO()
         path.write(
-            f'M {center.x} {center.y} '
-            f'L {p0.x} {p0.y} '
+            f'M {cx} {cy} '
+            f'L {x0} {y0} '
         )
         arm = self.start_arm
         for _ in range(n):
-            pm = Polar(r, arm - step_angle / 2) + center
+            xm, ym = at(arm - step_angle / 2)
             arm -= step_angle
-            p2 = Polar(r, arm) + center
-            path.write(f'{qbezeir_svg_given_middle(p0, p2, pm)} ')
-            p0 = p2
+            x2, y2 = at(arm)
+            path.write(f'{qbezeir_svg_given_middle_xy(x0, y0, x2, y2, xm, ym)} ')
+            x0, y0 = x2, y2
 
-        p2 = Polar(r, self.end_arm) + center
-        pm = Polar(r, (arm + self.end_arm) / 2) + center
-        path.write(f'{qbezeir_svg_given_middle(p0, p2, pm)} Z')
+        x2, y2 = at(self.end_arm)
+        xm, ym = at((arm + self.end_arm) / 2)
+        path.write(f'{qbezeir_svg_given_middle_xy(x0, y0, x2, y2, xm, ym)} Z')
 
         return dict(
             type='path',
@@ -0,0 +1,314 @@
+from collections.abc import Iterable, Iterator
+from typing import Optional, final
+
+import numpy as np
+from sortedcontainers import SortedList
+
+from algorithm import Group, PreparedPoints, circular_subtraction
+from common import reduce_angle
+from geometry.point import PointBase
+from geometry.sector import FixedSector, SectorBase
+from sweep import sweep_limits
+
+# Key of a window is the angle of its first alias and the number of aliases inside.
+# Window of all aliases has a dedicated key as it can start at any alias
+Key = tuple
+ALL: Key = ()
+
+
+@final
+class IncrementalGroups:
+    """
+    Groups of points maintained under insertions and removals of points.
+
+    Every group found by find_all_groups is one of two windows of every alias:
+    the back window contains the alias and all aliases counterclockwise from it within the arc,
+    the forward window contains all aliases clockwise from the alias within the arc except the alias itself.
+    Hence an update recomputes only windows of aliases within the arc from the updated one.
+    Windows are counted, a group disappears when no alias refers to it
+    """
+    __slots__ = '_circle', '_arc', '_angles', '_aliases', '_windows', '_counts', '_groups'
+
+    def __init__(self, sector: SectorBase, points: Iterable[PointBase] = (), /):
+        self._circle = sector.circle
+        self._arc = sector.arc
+        # Angles of aliases in ascending order, clockwise direction is descending
+        self._angles = SortedList()
+        self._aliases: dict[float, list[PointBase]] = {}
+        # Back and forward windows of every alias
+        self._windows: dict[float, tuple[Key, Optional[Key]]] = {}
+        self._counts: dict[Key, int] = {}
+        self._groups: dict[Key, Group] = {}
+        # Added and removed points are found by PointBase.fi, so angles of columns are not used
+        self._build(PreparedPoints(self._circle, list(points)))
+
+    def _build(self, prepared: PreparedPoints, /):
+        fi = prepared.angles
+        n = len(fi)
+        if n == 0:
+            return
+
+        points = prepared.points
+        offsets = prepared.offsets.tolist()
+        angles = fi.tolist()
+        self._angles.update(angles)
+        for i, a in enumerate(angles):
+            self._aliases[a] = list(points[offsets[i]:offsets[i + 1]])
+
+        # Same limits as the sweep uses, see sweep_windows
+        limits = sweep_limits(fi, self._arc)
+        backs = np.searchsorted(np.concatenate((limits - n, limits)), np.arange(n), 'right') - n
+        for d, (limit, back) in enumerate(zip(limits.tolist(), backs.tolist())):
+            back = max(back, d - n + 1)
+            size = d + 1 - back
+            back_key = ALL if size == n else (angles[back % n], size)
+            size = limit - d - 1
+            forward_key = (angles[(d + 1) % n], size) if size > 0 else None
+            self._windows[angles[d]] = back_key, forward_key
+            for key in (back_key, forward_key):
+                if key is not None:
+                    self._counts[key] = self._counts.get(key, 0) + 1
+
+        for a in angles:
+            back_key, forward_key = self._windows[a]
+            for key, forward in ((back_key, False), (forward_key, True)):
+                if key is not None and key not in self._groups:
+                    self._groups[key] = self._make_group(key, a, forward)
+
+    @property
+    def circle(self, /):
+        return self._circle
+
+    @property
+    def arc(self, /):
+        return self._arc
+
+    def __len__(self, /):
+        return len(self._groups)
+
+    def __iter__(self, /) -> Iterator[Group]:
+        return iter(self._groups.values())
+
+    def __contains__(self, item, /):
+        return isinstance(item, Group) and item in self._groups.values()
+
+    def __repr__(self, /):
+        return f'{self.__class__.__name__}({self._circle}, {len(self._angles)} aliases, {len(self._groups)} groups)'
+
+    # region Windows
+    def _angle(self, i: int, /) -> float:
+        return self._angles[i % len(self._angles)]
+
+    def _count_within_arc(self, k: int, step: int, /) -> int:
+        """
+        Returns the number of aliases after alias k within the arc from it.
+        Step 1 looks counterclockwise, step -1 looks clockwise
+        """
+        n = len(self._angles)
+        a = self._angle(k)
+        arc = self._arc
+
+        if step > 0:
+            def inside(t: int, /) -> bool:
+                return circular_subtraction(self._angle(k + t), a) <= arc
+        else:
+            def inside(t: int, /) -> bool:
+                return circular_subtraction(a, self._angle(k - t)) <= arc
+
+        lo, hi = 0, n - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if inside(mid):
+                lo = mid
+            else:
+                hi = mid - 1
+
+        return lo
+
+    def _compute_windows(self, k: int, /) -> tuple[Key, Optional[Key]]:
+        n = len(self._angles)
+        size = self._count_within_arc(k, 1) + 1
+        back_key = ALL if size == n else (self._angle(k + size - 1), size)
+        size = self._count_within_arc(k, -1)
+        forward_key = (self._angle(k - 1), size) if size > 0 else None
+        return back_key, forward_key
+
+    def _contains(self, key: Key, k: int, /) -> bool:
+        """
+        Checks whether the window contains alias k
+        """
+        if key == ALL:
+            return True
+
+        first, size = key
+        n = len(self._angles)
+        return (self._angles.index(first) - k) % n < size
+
+    def _affected(self, k: int, /) -> list[float]:
+        """
+        Returns angles of aliases which windows may contain alias k.
+        Back window of the counterclockwise neighbour may also turn into the window of all aliases
+        """
+        cw = self._count_within_arc(k, -1)
+        ccw = max(self._count_within_arc(k, 1), 1)
+        return list(dict.fromkeys(self._angle(i) for i in range(k - cw, k + ccw + 1)))
+
+    def _make_group(self, key: Key, owner: float, forward: bool, /) -> Group:
+        arc = self._arc
+        n = len(self._angles)
+        k = self._angles.index(owner)
+        if key == ALL:
+            first, size = self._angle(k + n - 1), n
+        else:
+            first, size = key
+
+        # region Collect points clockwise from the first alias
+        i = self._angles.index(first)
+        angles = list(self._angles.islice(max(i - size + 1, 0), i + 1, reverse=True))
+        if len(angles) < size:
+            angles += self._angles.islice(n - size + len(angles), n, reverse=True)
+
+        points = []
+        for a in angles:
+            points += self._aliases[a]
+        # endregion
+
+        # Sectors are the same as the sweep forms
+        if n == 1:
+            start = reduce_angle(owner + arc / 2)
+        elif forward:
+            gamma = circular_subtraction(owner, self._angle(k - 1))
+            omega = circular_subtraction(owner - arc, self._angle(k - size - 1))
+            start = reduce_angle(owner - min(gamma, omega) / 2)
+        else:
+            start = reduce_angle(owner + arc)
+
+        return Group.from_points(FixedSector(self._circle, arc, start), points)
+    # endregion
+
+    # region Updates
+    def _release(self, angles: list[float], k: int, /) -> tuple[dict[Key, Group], set[Key]]:
+        """
+        Releases windows of aliases with given angles.
+        Returns groups which are no longer referred and keys of windows containing alias k
+        """
+        released = {}
+        changed = set()
+        for a in angles:
+            for key in self._windows.pop(a):
+                if key is None:
+                    continue
+
+                if self._contains(key, k):
+                    changed.add(key)
+
+                self._counts[key] -= 1
+                if self._counts[key] == 0:
+                    del self._counts[key]
+                    released[key] = self._groups.pop(key)
+
+        return released, changed
+
+    def _acquire(self, angles: list[float], k: Optional[int], /) -> tuple[dict[Key, tuple[float, bool]], set[Key]]:
+        """
+        Computes windows of aliases with given angles.
+        Returns newly referred keys with their owners and keys of windows containing alias k
+        """
+        acquired = {}
+        changed = set()
+        for a in angles:
+            i = self._angles.index(a)
+            windows = self._compute_windows(i)
+            self._windows[a] = windows
+            for key, forward in zip(windows, (False, True)):
+                if key is None:
+                    continue
+
+                if k is not None and self._contains(key, k):
+                    changed.add(key)
+
+                count = self._counts.get(key, 0)
+                self._counts[key] = count + 1
+                if count == 0:
+                    acquired[key] = a, forward
+
+        return acquired, changed
+
+    def _commit(self, released: dict[Key, Group], acquired: dict[Key, tuple[float, bool]], changed: set[Key], /
+                ) -> tuple[list[Group], list[Group]]:
+        appeared = []
+        disappeared = []
+        for key, group in released.items():
+            if key in acquired and key not in changed:
+                # Same window of the same points is referred again
+                del acquired[key]
+                self._groups[key] = group
+            else:
+                disappeared.append(group)
+
+        for key, (owner, forward) in acquired.items():
+            group = self._make_group(key, owner, forward)
+            self._groups[key] = group
+            appeared.append(group)
+
+        # The window of all aliases can turn into a usual window of the same points and vice versa
+        if appeared and disappeared:
+            same = set(appeared).intersection(disappeared)
+            appeared = [g for g in appeared if g not in same]
+            disappeared = [g for g in disappeared if g not in same]
+
+        return appeared, disappeared
+
+    def add_point(self, p: PointBase, /) -> tuple[list[Group], list[Group]]:
+        """
+        Adds the point and returns groups which appeared and disappeared.
+        Points outside the circle are ignored
+        """
+        if p not in self._circle:
+            return [], []
+
+        fi = (p - self._circle.center).fi
+        alias = self._aliases.get(fi)
+        if alias is None:
+            self._angles.add(fi)
+            self._aliases[fi] = [p]
+        elif any(q is p for q in alias):
+            raise ValueError(f'point {p} is already added')
+        else:
+            alias.append(p)
+
+        k = self._angles.index(fi)
+        affected = self._affected(k)
+        released, _ = self._release([a for a in affected if a in self._windows], k)
+        acquired, changed = self._acquire(affected, k)
+        return self._commit(released, acquired, changed)
+
+    def remove_point(self, p: PointBase, /) -> tuple[list[Group], list[Group]]:
+        """
+        Removes the point and returns groups which appeared and disappeared.
+        Points outside the circle are ignored like in add_point
+        """
+        if p not in self._circle:
+            return [], []
+
+        fi = (p - self._circle.center).fi
+        alias = self._aliases.get(fi, ())
+        for i, q in enumerate(alias):
+            if q is p:
+                break
+        else:
+            raise ValueError(f'point {p} is not added')
+
+        k = self._angles.index(fi)
+        affected = self._affected(k)
+        released, changed = self._release(affected, k)
+
+        del alias[i]
+        if len(alias) == 0:
+            del self._aliases[fi]
+            self._angles.remove(fi)
+            affected.remove(fi)
+
+        acquired, _ = self._acquire(affected, None)
+        return self._commit(released, acquired, changed)
+    # endregion
@@ -0,0 +1,141 @@
+from collections import Counter
+from collections.abc import Callable
+from time import perf_counter
+from typing import NamedTuple, Optional, final
+
+
+class Step(NamedTuple):
+    """
+    State of the sweep after a step.
+    Action is one of:
+     extend - end arm is moved to the next point;
+     jump - the only point inside is replaced by the next point;
+     rotate - the first point inside is excluded
+    """
+    index: int
+    action: str
+    first: int
+    afterlast: int
+    start_arm: float
+
+
+class Instrumentation:
+    """
+    Receives timings of phases, counters and steps of find_all_groups.
+    Methods of this class do nothing, subclasses override needed ones.
+    Instrumentation is optional, find_all_groups skips all calls if it is not passed
+    """
+    __slots__ = ()
+
+    def phase(self, name: str, seconds: float, /):
+        """
+        Called when a phase is done: filter, alias, sort or sweep for the reference sweep,
+        prepare or sweep for the vectorized one.
+        Time of the sweep does not include time spent by the consumer of groups
+        """
+
+    def count(self, name: str, value: int = 1, /):
+        """
+        Called to increase a counter
+        """
+
+    def alias_sizes(self, sizes: Counter, /):
+        """
+        Called once with the number of aliases of every size
+        """
+
+    @property
+    def steps(self, /) -> bool:
+        """
+        Whether step is called, steps are not built otherwise
+        """
+        return False
+
+    def step(self, step: Step, /):
+        """
+        Called after every step of the reference sweep
+        """
+
+
+@final
+class Metrics(Instrumentation):
+    """
+    Instrumentation collecting timings and counters of one or many runs.
+    Steps are passed to on_step if it is given
+    """
+    __slots__ = '_timings', '_counters', '_sizes', '_on_step'
+
+    def __init__(self, /, on_step: Optional[Callable[[Step], None]] = None):
+        self._timings: Counter = Counter()
+        self._counters: Counter = Counter()
+        self._sizes: Counter = Counter()
+        self._on_step = on_step
+
+    @property
+    def timings(self, /) -> dict[str, float]:
+        return dict(self._timings)
+
+    @property
+    def counters(self, /) -> dict[str, int]:
+        return dict(self._counters)
+
+    @property
+    def sizes(self, /) -> dict[int, int]:
+        """
+        Number of aliases of every size
+        """
+        return dict(self._sizes)
+
+    def phase(self, name: str, seconds: float, /):
+        self._timings[name] += seconds
+
+    def count(self, name: str, value: int = 1, /):
+        self._counters[name] += value
+
+    def alias_sizes(self, sizes: Counter, /):
+        self._sizes.update(sizes)
+
+    @property
+    def steps(self, /) -> bool:
+        return self._on_step is not None
+
+    def step(self, step: Step, /):
+        self._on_step(step)
+
+    def clear(self, /):
+        self._timings.clear()
+        self._counters.clear()
+        self._sizes.clear()
+
+    def export(self, /, prefix: str = 'groups') -> dict[str, float]:
+        """
+        Returns flat metrics named prefix.kind.name for pipelines accepting name-value pairs
+        """
+        metrics = {f'{prefix}.seconds.{name}': value for name, value in sorted(self._timings.items())}
+        metrics.update((f'{prefix}.count.{name}', value) for name, value in sorted(self._counters.items()))
+        metrics.update((f'{prefix}.alias_size.{size}', count) for size, count in sorted(self._sizes.items()))
+        return metrics
+
+    def __repr__(self, /):
+        return f'{self.__class__.__name__}({self.export()})'
+
+
+class Timer:
+    """
+    Accumulates time of a phase between start and stop calls
+    """
+    __slots__ = '_seconds', '_start'
+
+    def __init__(self, /):
+        self._seconds = 0.
+        self._start = 0.
+
+    @property
+    def seconds(self, /) -> float:
+        return self._seconds
+
+    def start(self, /):
+        self._start = perf_counter()
+
+    def stop(self, /):
+        self._seconds += perf_counter() - self._start
@@ -0,0 +1,274 @@
+import os
+import struct
+from collections.abc import Iterable, Sequence
+from typing import BinaryIO, Union, final
+
+import numpy as np
+
+from algorithm import Group, PreparedPoints, find_all_groups
+from common import Real
+from geometry.circle import CircleBase, FixedCircle
+from geometry.grid import PointGrid
+from geometry.point import Cartesian, PointArray, PointBase, arctan2
+from geometry.sector import FixedSector, SectorBase
+
+Path = Union[str, os.PathLike]
+
+# File layout, all numbers are little-endian:
+#  header: magic, version, number of points, number of aliases, number of groups, circle center and radius;
+#  angles of aliases in descending order, float64[aliases];
+#  offsets of aliases in indices, int64[aliases + 1];
+#  indexes of points in the original sequence ordered by aliases, int64[points];
+#  group records, see RECORD.
+# Afterlast indexes of groups are not reduced and may exceed the number of aliases, see GroupSet
+MAGIC = b'GRPS'
+VERSION = 1
+HEADER = struct.Struct('<4sIqqqddd')
+RECORD = np.dtype([('first', '<i8'), ('afterlast', '<i8'), ('start_arm', '<f8'), ('arc', '<f8')])
+
+
+class FormatError(ValueError):
+    pass
+
+
+@final
+class GroupWriter:
+    """
+    Writes groups of points inside a circle to a file as they are found.
+    Points are aliased once and written first, every group is stored as a record of its aliases and sector.
+    Groups are buffered and written by chunks of buffer_size records.
+    Points must be aliased with the tolerance used to find the groups.
+    The number of groups is written into the header on close
+    """
+    __slots__ = '_file', '_prepared', '_exact', '_count', '_buffer', '_buffer_size'
+
+    def __init__(self, path: Path, circle: CircleBase, points: Union[PointGrid, PointArray, Iterable[PointBase]], /,
+                 buffer_size: int = 1 << 12, *,
+                 tolerance: Real = 0.):
+        if buffer_size < 1:
+            raise ValueError(f'buffer size must be positive, got {buffer_size}')
+
+        self._prepared = prepared = PreparedPoints(circle, points, None, tolerance)
+        # Angles of points are computed like in PreparedPoints
+        self._exact = not isinstance(points, (PointGrid, PointArray))
+        self._count = 0
+        self._buffer = []
+        self._buffer_size = buffer_size
+        self._file: BinaryIO = open(path, 'wb')
+        try:
+            self._write_header()
+            self._file.write(prepared.angles.astype('<f8').tobytes())
+            self._file.write(prepared.offsets.astype('<i8').tobytes())
+            self._file.write(prepared.indices.astype('<i8').tobytes())
+        except BaseException:
+            self._file.close()
+            raise
+
+    def _write_header(self, /):
+        prepared = self._prepared
+        circle = prepared.circle
+        self._file.write(HEADER.pack(
+            MAGIC,
+            VERSION,
+            len(prepared.indices),
+            len(prepared.angles),
+            self._count,
+            circle.center.x,
+            circle.center.y,
+            circle.radius,
+        ))
+
+    @property
+    def prepared(self, /) -> PreparedPoints:
+        return self._prepared
+
+    @property
+    def closed(self, /) -> bool:
+        return self._file.closed
+
+    def __len__(self, /):
+        return self._count + len(self._buffer)
+
+    def __repr__(self, /):
+        return f'{self.__class__.__name__}({self._file.name!r}, {len(self)} groups)'
+
+    def write(self, group: Group, /):
+        """
+        Writes a group of points of the circle
+        """
+        if self._file.closed:
+            raise ValueError('writer is closed')
+
+        sector = group.sector
+        if sector.circle != self._prepared.circle:
+            raise ValueError(f'group {group} is not inside {self._prepared.circle}')
+
+        prepared = self._prepared
+        fi = prepared.angles
+        n = len(fi)
+        # Points of a group are ordered by aliases, the first point is in the first alias
+        p = group.points[0]
+        a = float(arctan2(np.array([p.y - sector.circle.center.y]), np.array([p.x - sector.circle.center.x]),
+                          self._exact)[0])
+        first = n - 1 - int(np.searchsorted(fi[::-1], a))
+        if first < 0 or fi[first] != a:
+            raise ValueError(f'point {p} is not prepared')
+
+        # Aliases are not empty, so the number of points determines the afterlast index
+        offsets = prepared.offsets
+        end = offsets[first] + len(group.points)
+        afterlast = int(np.searchsorted(offsets, end)) if end <= offsets[-1] else \
+            n + int(np.searchsorted(offsets, end - offsets[-1]))
+        self._buffer.append((first, afterlast, sector.start_arm, sector.arc))
+        if len(self._buffer) >= self._buffer_size:
+            self.flush()
+
+    def write_all(self, groups: Iterable[Group], /):
+        for g in groups:
+            self.write(g)
+
+    def flush(self, /):
+        if self._buffer:
+            self._file.write(np.array(self._buffer, dtype=RECORD).tobytes())
+            self._count += len(self._buffer)
+            self._buffer = []
+
+        self._file.flush()
+
+    def close(self, /):
+        if self._file.closed:
+            return
+
+        try:
+            self.flush()
+            self._file.seek(0)
+            self._write_header()
+        finally:
+            self._file.close()
+
+    def __enter__(self, /):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb, /):
+        self.close()
+
+
+def save_groups(path: Path, sector: SectorBase, points: Union[PointGrid, PointArray, Iterable[PointBase]], /,
+                align: bool = False, *,
+                vectorized: bool = False,
+                tolerance: Real = 0.) -> int:
+    """
+    Finds all groups like find_all_groups and streams them to a file.
+    Returns the number of written groups
+    """
+    if not isinstance(points, (PointGrid, PointArray)):
+        points = list(points)
+
+    with GroupWriter(path, sector.circle, points, tolerance=tolerance) as writer:
+        writer.write_all(find_all_groups(sector, points, align, vectorized=vectorized, tolerance=tolerance))
+        writer.flush()
+        return len(writer)
+
+
+@final
+class GroupFile:
+    """
+    Groups read from a file written by GroupWriter.
+    The file is memory-mapped, only accessed groups and their aliases are read
+    """
+    __slots__ = '_path', '_data', '_circle', '_angles', '_offsets', '_indices', '_records'
+
+    def __init__(self, path: Path, /):
+        self._path = path
+        self._data = data = np.memmap(path, dtype=np.uint8, mode='r')
+        if len(data) < HEADER.size:
+            raise FormatError(f'file {path} is too short')
+
+        magic, version, points, aliases, groups, x, y, radius = HEADER.unpack(data[:HEADER.size].tobytes())
+        if magic != MAGIC:
+            raise FormatError(f'file {path} is not a group file')
+        if version != VERSION:
+            raise FormatError(f'unsupported version {version} of file {path}')
+
+        self._circle = FixedCircle(Cartesian(x, y), radius)
+        offset = HEADER.size
+
+        def take(dtype: np.dtype, count: int, /) -> np.ndarray:
+            nonlocal offset
+            size = np.dtype(dtype).itemsize * count
+            if offset + size > len(data):
+                raise FormatError(f'file {path} is truncated')
+
+            array = data[offset:offset + size].view(dtype)
+            offset += size
+            return array
+
+        self._angles = take(np.dtype('<f8'), aliases)
+        self._offsets = take(np.dtype('<i8'), aliases + 1)
+        self._indices = take(np.dtype('<i8'), points)
+        self._records = take(RECORD, groups)
+
+    @property
+    def path(self, /):
+        return self._path
+
+    @property
+    def circle(self, /):
+        return self._circle
+
+    @property
+    def angles(self, /) -> np.ndarray:
+        return self._angles
+
+    @property
+    def offsets(self, /) -> np.ndarray:
+        return self._offsets
+
+    @property
+    def indices(self, /) -> np.ndarray:
+        return self._indices
+
+    @property
+    def records(self, /) -> np.ndarray:
+        """
+        Structured array of group records with fields first, afterlast, start_arm and arc
+        """
+        return self._records
+
+    def __len__(self, /):
+        return len(self._records)
+
+    def __repr__(self, /):
+        return f'{self.__class__.__name__}({self._path!r}, {self._circle}, {len(self)} groups)'
+
+    def _check_index(self, index: int, /) -> int:
+        n = len(self._records)
+        if not -n <= index < n:
+            raise IndexError(f'group index {index} is out of range')
+
+        return index % n
+
+    def sector(self, index: int, /) -> FixedSector:
+        record = self._records[self._check_index(index)]
+        return FixedSector(self._circle, float(record['arc']), float(record['start_arm']))
+
+    def group_indices(self, index: int, /) -> np.ndarray:
+        """
+        Returns indexes of points of the group in the original sequence ordered by aliases
+        """
+        record = self._records[self._check_index(index)]
+        n = len(self._angles)
+        first = int(record['first'])
+        afterlast = int(record['afterlast']) - first + first % n
+        first %= n
+        offsets = self._offsets
+        if afterlast <= n:
+            return np.array(self._indices[offsets[first]:offsets[afterlast]])
+
+        return np.concatenate((self._indices[offsets[first]:], self._indices[:offsets[afterlast - n]]))
+
+    def group(self, index: int, points: Sequence[PointBase], /) -> Group:
+        """
+        Restores the group from points the file was written for
+        """
+        return Group.from_points(self.sector(index), [points[i] for i in self.group_indices(index).tolist()])
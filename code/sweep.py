@@ -0,0 +1,300 @@
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+from common import TWOPI, reduce_angles
+
+
+def circular_subtractions(a1: np.ndarray, a2: np.ndarray, /) -> np.ndarray:
+    d = a1 - a2
+    return np.where(a1 >= a2, d, d + TWOPI)
+
+
+def check_tolerance(value: float, /, arc: float = TWOPI):
+    """
+    Tolerance must be less than the arc, an alias would not fit into the sector otherwise
+    """
+    if not 0 <= value < arc:
+        raise ValueError(f'tolerance must be in range [0, {arc}), got {value}')
+
+
+def alias_angles(fi: np.ndarray, /, tolerance: float = 0.) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Aliases equal angles and sorts aliases in descending order.
+    Returns unique angles, indexes of angles grouped by aliases
+    and offsets of every alias inside these indexes.
+    Indexes of alias i are order[offsets[i]:offsets[i + 1]].
+
+    If tolerance is positive, angles are sorted and merged into aliases clockwise, also across -pi.
+    Alias takes angles not farther than tolerance from its first angle, so it spans at most tolerance.
+    Angle of such alias is its most counterclockwise angle,
+    indexes of an alias are ordered by angles counterclockwise to clockwise
+    """
+    check_tolerance(tolerance)
+    if tolerance > 0:
+        return _merge_angles(fi, tolerance)
+
+    unique, inverse, counts = np.unique(fi, return_inverse=True, return_counts=True)
+    n = len(unique)
+    unique = unique[::-1]
+    inverse = n - 1 - inverse.ravel()
+    order = np.argsort(inverse, kind='stable')
+    offsets = np.zeros(n + 1, dtype=np.intp)
+    np.cumsum(counts[::-1], out=offsets[1:])
+    return unique, order, offsets
+
+
+def _merge_angles(fi: np.ndarray, tolerance: float, /) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Equal angles keep the original order
+    order = np.argsort(-fi, kind='stable')
+    fi = fi[order]
+    n = len(fi)
+    if n == 0:
+        return fi, order, np.zeros(1, dtype=np.intp)
+
+    # Aliases must not cross a gap wider than tolerance, so the turn is cut at such gap if any.
+    # Angles after the cut continue clockwise across -pi
+    cut = 0
+    if fi[-1] + TWOPI - fi[0] <= tolerance:
+        gaps = np.flatnonzero(fi[:-1] - fi[1:] > tolerance)
+        if len(gaps) > 0:
+            cut = int(gaps[0]) + 1
+
+    turn = np.concatenate((fi[cut:], fi[:cut] - TWOPI))
+    order = np.concatenate((order[cut:], order[:cut]))
+    heads = _alias_heads(turn, tolerance)
+
+    # Aliases starting after -pi have the largest angles and go first
+    wrapped = int(np.searchsorted(heads, n - cut))
+    split = int(heads[wrapped]) if wrapped < len(heads) else n
+    order = np.concatenate((order[split:], order[:split]))
+    heads = np.concatenate((heads[wrapped:] - split, heads[:wrapped] + n - split))
+    # Angles are taken before the cut, so they are exactly the angles of points
+    angles = fi[(heads + split + cut) % n]
+
+    offsets = np.append(heads, n).astype(np.intp)
+    return angles, order, offsets
+
+
+def _alias_heads(fi: np.ndarray, tolerance: float, /) -> np.ndarray:
+    """
+    Returns first indexes of aliases of angles sorted in descending order.
+    Alias starts at the first angle farther than tolerance from the first angle of the previous alias.
+    Runs of angles with gaps not wider than tolerance are split only if they span more than tolerance
+    """
+    n = len(fi)
+    starts = np.ones(n, dtype=bool)
+    starts[1:] = fi[:-1] - fi[1:] > tolerance
+    starts = np.flatnonzero(starts)
+    ends = np.append(starts[1:], n)
+    wide = np.flatnonzero(fi[starts] - fi[ends - 1] > tolerance)
+    if len(wide) == 0:
+        return starts
+
+    negative = -fi
+    heads = [starts]
+    for start, end in zip(starts[wide].tolist(), ends[wide].tolist()):
+        head = start
+        while True:
+            # Searching by threshold may be off by rounding errors, the exact comparison decides
+            i = int(np.searchsorted(negative, negative[head] + tolerance, 'right'))
+            i = min(max(i, head + 1), end)
+            while i > head + 1 and fi[head] - fi[i - 1] > tolerance:
+                i -= 1
+            while i < end and not fi[head] - fi[i] > tolerance:
+                i += 1
+
+            if i == end:
+                break
+
+            heads.append(np.array([i]))
+            head = i
+
+    return np.unique(np.concatenate(heads))
+
+
+def compensated_sums(values: np.ndarray, /) -> np.ndarray:
+    """
+    Returns prefix sums of values in row 0 and prefix sums of their rounding errors in row 1, both start with 0.
+    Rounding errors are found exactly, so small values are not lost next to large ones, see range_sums
+    """
+    sums = np.zeros((2, len(values) + 1))
+    np.cumsum(values, out=sums[0, 1:])
+    before, after = sums[0, :-1], sums[0, 1:]
+    # Error of every addition, after = before + values - errors exactly
+    added = after - before
+    np.cumsum((before - (after - added)) + (values - added), out=sums[1, 1:])
+    return sums
+
+
+def range_sums(sums: Sequence[float], errors: Sequence[float], start, stop, turns, /):
+    """
+    Returns sums of values from start to stop positions, see compensated_sums.
+    stop is turns times around the end after start, turns are 0 or 1.
+    Works with arrays of positions and with single positions of lists, the results are equal
+    """
+    return ((turns * sums[-1] - sums[start]) + sums[stop]) + ((turns * errors[-1] - errors[start]) + errors[stop])
+
+
+def sweep_limits(fi: np.ndarray, arc: float, /, r: np.ndarray = None) -> np.ndarray:
+    """
+    Returns limits of unique angles sorted in descending order.
+    Point r leaves the rotating sector when the first point not inside is farther than arc from it.
+    Index of such point is the limit of r, it is also the afterlast index of the group formed after the removal.
+    Limits are not reduced and are in range [r + 1, r + n].
+    If indexes r are given, only their limits are computed
+    """
+    n = len(fi)
+    r = np.arange(n) if r is None else np.asarray(r, dtype=np.intp)
+    a = fi[r]
+    if 4 * len(r) < n:
+        # Count angles not less than a - arc in fi and fi - 2pi without building two turns
+        ascending = fi[::-1]
+        threshold = a - arc
+        inside = 2 * n - np.searchsorted(ascending, threshold, 'left') - \
+                 np.searchsorted(ascending, threshold + TWOPI, 'left')
+    else:
+        ext = np.concatenate((fi, fi - TWOPI))
+        inside = np.searchsorted(-ext, arc - a, 'right')
+
+    limits = np.clip(inside, r + 1, r + n)
+
+    # Searching by threshold may be off by rounding errors, adjust limits to the exact comparison
+    def exceeds(idx: np.ndarray, /) -> np.ndarray:
+        return circular_subtractions(a, fi[idx % n]) > arc
+
+    while (down := (limits - 1 > r) & exceeds(limits - 1)).any():
+        limits[down] -= 1
+    while (up := (limits < r + n) & ~exceeds(limits)).any():
+        limits[up] += 1
+
+    return limits
+
+
+def sweep_events(fi: np.ndarray, arc: float, lo: int, hi: int, afterlast0: int, /
+                 ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns groups formed by the sweep from the removal of point lo to the removal of point hi exclusively.
+    afterlast0 is the afterlast index of the first group, i.e. the limit of point 0.
+    Groups of consecutive ranges [lo, hi) are consecutive parts of the sweep, see sweep_windows
+    """
+    n = len(fi)
+    r = np.arange(lo, hi)
+    # Limit of hi bounds additions of the range, the limit of n is the limit of 0 a turn later
+    limits = sweep_limits(fi, arc, np.arange(lo, min(hi + 1, n)))
+    if hi == n:
+        limits = np.append(limits, afterlast0 + n)
+    bound = int(limits[-1])
+    limits = limits[:-1]
+    a = fi[lo:hi]
+    following = np.roll(fi, -1)[lo:hi] if hi == n else fi[lo + 1:hi + 1]
+    # If the only point inside leaves the sector, the next point is added in the same step
+    single = limits == r + 1
+
+    # region Removals
+    gamma = circular_subtractions(a, following)
+    omega = circular_subtractions(a - arc, fi[limits % n])
+    rho = np.minimum(gamma, omega) / 2
+    rem_first = r + 1
+    rem_afterlast = np.where(single, r + 2, limits)
+    rem_start = np.where(single, reduce_angles(following + arc), reduce_angles(a - rho))
+    # endregion
+
+    # region Additions
+    j = np.arange(max(int(limits[0]) if len(limits) else bound, afterlast0), min(bound, afterlast0 + n))
+    prev = j - 1
+    absorbed = np.zeros(len(j), dtype=bool)
+    inner = prev < n
+    # Previous points are from lo up to the bound, limits after hi are needed only for a part of the sweep
+    if hi < n:
+        known = np.concatenate((limits, sweep_limits(fi, arc, np.arange(hi, min(bound, n)))))
+    else:
+        known = limits
+    absorbed[inner] = known[prev[inner] - lo] == prev[inner] + 1
+    j = j[~absorbed]
+    add_first = lo + np.searchsorted(limits, j, 'right')
+    add_afterlast = j + 1
+    add_start = reduce_angles(fi[j % n] + arc)
+    # endregion
+
+    # region Merge events
+    # Addition j happens right after point j - 1 is added,
+    # removal r happens right before point limits[r] is added
+    order = np.argsort(np.concatenate((2 * limits - 1, 2 * j)), kind='stable')
+    first = np.concatenate((rem_first, add_first))[order]
+    afterlast = np.concatenate((rem_afterlast, add_afterlast))[order]
+    start = np.concatenate((rem_start, add_start))[order]
+    # endregion
+
+    return first, afterlast, start
+
+
+def join_windows(fi: np.ndarray, afterlast0: int, parts: Iterable[tuple[np.ndarray, np.ndarray, np.ndarray]], /
+                 ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Joins consecutive parts of the sweep returned by sweep_events and prepends the first group
+    """
+    parts = list(parts)
+    first = np.concatenate([[0]] + [p[0] for p in parts])
+    afterlast = np.concatenate([[afterlast0]] + [p[1] for p in parts])
+    start = np.concatenate([fi[:1]] + [p[2] for p in parts])
+
+    # Stop before the first group is met again after a full turn
+    n = len(fi)
+    repeats = (afterlast - first == afterlast0) & (first >= n)
+    if repeats.any():
+        k = int(np.argmax(repeats))
+        first = first[:k]
+        afterlast = afterlast[:k]
+        start = start[:k]
+
+    # If the arc holds all points, the window of all aliases is met at every alias, it is kept once
+    whole = np.flatnonzero(afterlast - first == n)
+    if len(whole) > 1:
+        keep = np.ones(len(first), dtype=bool)
+        keep[whole[1:]] = False
+        first = first[keep]
+        afterlast = afterlast[keep]
+        start = start[keep]
+
+    return first, afterlast, start
+
+
+def sweep_windows(fi: np.ndarray, arc: float, /) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Runs the rotating-sector sweep over unique angles sorted in descending order.
+    Returns first and afterlast indexes of aliases inside every group and start arms of groups' sectors.
+    Indexes are not reduced, afterlast may exceed the number of angles if a group wraps around.
+    At least 2 angles are required.
+    """
+    n = len(fi)
+    afterlast0 = int(sweep_limits(fi, arc, [0])[0])
+    return join_windows(fi, afterlast0, [sweep_events(fi, arc, 0, n, afterlast0)])
+
+
+def align_windows(fi: np.ndarray, arc: float, first: np.ndarray, afterlast: np.ndarray, start: np.ndarray,
+                  min_wing: float, min_delta: float, /) -> np.ndarray:
+    """
+    Returns start arms of sectors placed between the neighbouring points outside of groups.
+    Sectors are not moved if wings are less than min_wing or distances to outer points are less than min_delta.
+    """
+    n = len(fi)
+    a1 = fi[first % n]
+    an = fi[(afterlast - 1) % n]
+    teta = circular_subtractions(a1, an)
+    wing = (arc - teta) / 2
+    delta1 = circular_subtractions(fi[(first - 1) % n], a1)
+    delta2 = circular_subtractions(an, fi[afterlast % n])
+
+    move = (wing >= min_wing) & (delta1 >= min_delta) & (delta2 >= min_delta)
+    both = move & (wing < delta1) & (wing < delta2)
+    only1 = move & ~both & (wing < delta1)
+    only2 = move & ~both & ~only1 & (wing < delta2)
+    if np.any(move & ~(both | only1 | only2)):
+        raise RuntimeError('unreachable code reached')
+
+    return np.select(
+        [both, only1, only2],
+        [reduce_angles(a1 + wing), reduce_angles(an - delta2 / 2 + arc), reduce_angles(a1 + delta1 / 2)],
+        start,
+    )
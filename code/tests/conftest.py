@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Modules of the project are imported from the code directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,130 @@
+"""
+Slices of cyclic lists wrap around: items are taken from start to stop by step modulo length,
+until the first item is met again. Assigning and deleting such slices must change the same items as
+assigning and deleting them one by one in a plain list, rotation must work like deque.rotate
+"""
+import random
+from collections import deque
+
+import pytest
+
+from cyclic import CyclicList
+
+BOUNDS = [None] + list(range(-12, 13))
+STEPS = None, 1, 2, 3, -1, -2
+
+
+def cyclic_indices(n: int, s: slice, /) -> list[int]:
+    start = 0 if s.start is None else s.start
+    stop = n if s.stop is None else s.stop
+    step = 1 if s.step is None else s.step
+    indices = []
+    for i in range(start, stop, step):
+        if indices and i % n == indices[0]:
+            break
+
+        indices.append(i % n)
+
+    return indices
+
+
+def random_slices(rng: random.Random, /):
+    for _ in range(3000):
+        yield rng.randint(1, 8), slice(rng.choice(BOUNDS), rng.choice(BOUNDS), rng.choice(STEPS))
+
+
+@pytest.mark.parametrize('n, s, expected', [
+    (5, slice(3, 7), [3, 4, 0, 1]),
+    (5, slice(-2, 2), [3, 4, 0, 1]),
+    (5, slice(2, 2), []),
+    (5, slice(3, 1), []),
+    (5, slice(1, 3, -1), []),
+    (5, slice(1, -3, -1), [1, 0, 4, 3]),
+    (5, slice(0, 20, 2), [0, 2, 4, 1, 3]),
+    (4, slice(0, 20, 2), [0, 2]),
+    (5, slice(4, 100), [4, 0, 1, 2, 3]),
+])
+def test_slice_indices(n, s, expected):
+    assert cyclic_indices(n, s) == expected
+    assert CyclicList(range(n))[s] == expected
+
+
+def test_delitem():
+    rng = random.Random('delitem')
+    for n, s in random_slices(rng):
+        removed = set(cyclic_indices(n, s))
+        c = CyclicList(range(n))
+        del c[s]
+        assert c == [i for i in range(n) if i not in removed], (n, s)
+        assert type(c) is CyclicList
+
+
+def test_setitem():
+    rng = random.Random('setitem')
+    for n, s in random_slices(rng):
+        indices = cyclic_indices(n, s)
+        values = [100 + i for i in range(len(indices))]
+        expected = list(range(n))
+        for i, v in zip(indices, values):
+            expected[i] = v
+
+        c = CyclicList(range(n))
+        c[s] = values
+        assert c == expected, (n, s)
+
+        # Values may be an iterator
+        c = CyclicList(range(n))
+        c[s] = iter(values)
+        assert c == expected, (n, s)
+
+
+def test_self_assignment():
+    rng = random.Random('self')
+    for n, s in random_slices(rng):
+        c = CyclicList(range(n))
+        c[s] = c[s]
+        assert c == list(range(n)), (n, s)
+
+    # Values are read before the slice is changed
+    c = CyclicList(range(5))
+    c[3:6] = c.view(2, 5)
+    assert c == [4, 1, 2, 2, 3]
+
+
+def test_wrong_length():
+    rng = random.Random('length')
+    for n, s in random_slices(rng):
+        size = len(cyclic_indices(n, s))
+        for values in ([0] * (size + 1), [0] * (size - 1)):
+            if size == 0 and not values:
+                continue
+
+            c = CyclicList(range(n))
+            with pytest.raises(ValueError):
+                c[s] = values
+
+            assert c == list(range(n)), (n, s)
+
+
+@pytest.mark.parametrize('n', range(9))
+def test_rotate(n):
+    for steps in range(-2 * n - 3, 2 * n + 4):
+        c = CyclicList(range(n))
+        c.rotate(steps)
+        d = deque(range(n))
+        d.rotate(steps)
+        assert c == list(d), (n, steps)
+
+    c = CyclicList(range(n))
+    c.rotate()
+    d = deque(range(n))
+    d.rotate()
+    assert c == list(d)
+
+
+def test_empty():
+    c = CyclicList()
+    with pytest.raises(IndexError):
+        del c[0:1]
+    with pytest.raises(IndexError):
+        c[0:1] = []
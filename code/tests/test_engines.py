@@ -0,0 +1,108 @@
+"""
+The vectorized engine of find_all_groups must find the same groups as the reference sweep:
+equal groups with the same points in the same order and the same start arms of sectors
+"""
+import random
+from math import cos, pi, sin
+
+import pytest
+
+from algorithm import find_all_groups
+from common import rad
+from geometry import Cartesian, Circle, Sector
+from geometry.point import PointBase
+
+CENTERS = Cartesian(0, 0), Cartesian(0.1, -0.2)
+ARCS = rad(45), rad(60), pi / 2, rad(120), pi, rad(270), rad(359)
+
+
+def random_points(rng: random.Random, /) -> list[PointBase]:
+    return [Cartesian(rng.uniform(-1, 1), rng.uniform(-1, 1)) for _ in range(rng.randint(0, 40))]
+
+
+def collinear_points(rng: random.Random, /) -> list[PointBase]:
+    # Multiples by powers of 2 keep angles exactly equal
+    rays = [(rng.uniform(-1, 1), rng.uniform(-1, 1)) for _ in range(rng.randint(1, 6))]
+    points = []
+    for _ in range(rng.randint(1, 40)):
+        x, y = rng.choice(rays)
+        k = rng.choice((0.125, 0.25, 0.5, 1))
+        points.append(Cartesian(k * x, k * y))
+
+    return points
+
+
+def duplicate_points(rng: random.Random, /) -> list[PointBase]:
+    # Distinct point objects with equal coordinates, including the center of the circle
+    base = [Cartesian(rng.uniform(-1, 1), rng.uniform(-1, 1)) for _ in range(rng.randint(1, 4))]
+    return [rng.choice(base).copy() for _ in range(rng.randint(1, 40))] + [Cartesian(0, 0)]
+
+
+def grid_points(rng: random.Random, /) -> list[PointBase]:
+    return [Cartesian(rng.randint(-3, 3) / 4, rng.randint(-3, 3) / 4) for _ in range(rng.randint(1, 40))]
+
+
+def polygon_points(rng: random.Random, /) -> list[PointBase]:
+    m = rng.choice((3, 4, 6, 8, 12))
+    return [Cartesian(r * cos(2 * pi * k / m), r * sin(2 * pi * k / m)) for r in (1, 0.5) for k in range(m)]
+
+
+GENERATORS = random_points, collinear_points, duplicate_points, grid_points, polygon_points
+
+
+def run(sector: Sector, points: list[PointBase], align: bool, vectorized: bool, /) -> list:
+    return [
+        (g, [id(p) for p in g.points], g.sector.start_arm)
+        for g in find_all_groups(sector, points, align, vectorized=vectorized)
+    ]
+
+
+def check_engines(sector: Sector, points: list[PointBase], align: bool, /):
+    assert run(sector, points, align, True) == run(sector, points, align, False)
+
+
+@pytest.mark.parametrize('align', [False, True])
+@pytest.mark.parametrize('generate', GENERATORS, ids=lambda g: g.__name__)
+def test_engines_are_equal(generate, align):
+    rng = random.Random(generate.__name__)
+    for _ in range(100):
+        points = generate(rng)
+        arc = rng.choice(ARCS + (rad(rng.uniform(0.5, 359)),))
+        circle = Circle(rng.choice(CENTERS), rng.choice((0.5, 1., 2.)))
+        check_engines(Sector(circle, arc, rng.uniform(-3, 3)), points, align)
+
+
+@pytest.mark.parametrize('align', [False, True])
+@pytest.mark.parametrize('m', [4, 6, 8, 12])
+def test_exact_arc_ties(m, align):
+    # Neighbouring vertices of a regular polygon are exactly arc apart
+    points = [Cartesian(cos(2 * pi * k / m), sin(2 * pi * k / m)) for k in range(m)]
+    for arc in (2 * pi / m, 4 * pi / m, pi):
+        check_engines(Sector(Circle(Cartesian(0, 0), 1), arc, 0), points, align)
+
+
+@pytest.mark.parametrize('align', [False, True])
+@pytest.mark.parametrize('points', [
+    [],
+    [Cartesian(0.5, 0.5)],
+    [Cartesian(0, 0)],
+    [Cartesian(0.5, 0), Cartesian(0.25, 0)],
+    [Cartesian(-0.5, 0), Cartesian(-0.5, -0.)],
+    [Cartesian(2, 2)],
+], ids=['empty', 'single', 'center', 'one-ray', 'across-pi', 'outside'])
+def test_degenerate_inputs(points, align):
+    for arc in (rad(1), pi / 2, rad(359)):
+        check_engines(Sector(Circle(Cartesian(0, 0), 1), arc, 0), points, align)
+
+
+@pytest.mark.parametrize('vectorized', [False, True])
+@pytest.mark.parametrize('align', [False, True])
+@pytest.mark.parametrize('generate', GENERATORS, ids=lambda g: g.__name__)
+def test_groups_are_distinct(generate, align, vectorized):
+    # Arcs close to the full turn hold all points at every alias, the group of all points is found once
+    rng = random.Random(generate.__name__)
+    for _ in range(20):
+        points = generate(rng)
+        arc = rng.choice((rad(359), 2 * pi - 1e-9, rad(rng.uniform(0.5, 359))))
+        groups = list(find_all_groups(Sector(Circle(Cartesian(0, 0), 1), arc, 0), points, align, vectorized=vectorized))
+        assert len(set(groups)) == len(groups)
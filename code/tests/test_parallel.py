@@ -0,0 +1,73 @@
+"""
+The sweep split into chunks must find the same windows as the sequential one:
+joined parts of sweep_events in process and parallel_windows in a process pool
+"""
+import random
+from math import cos, pi, sin
+
+import numpy as np
+import pytest
+
+from algorithm import PreparedPoints, find_windows, one_deg, two_deg
+from batch import parallel_windows
+from common import rad
+from geometry import Cartesian, Circle
+from sweep import align_windows, join_windows, sweep_events, sweep_limits
+
+CHUNKS = 1, 2, 3, 5, 16
+ARCS = rad(30), pi / 2, pi, rad(300), 2 * pi - 1e-9
+
+
+def random_angles(rng: random.Random, /, polygon: bool = True) -> np.ndarray:
+    n = rng.randint(2, 60)
+    if polygon and rng.random() < 0.3:
+        # Vertices of a regular polygon are exactly arc apart for some arcs
+        points = [Cartesian(cos(2 * pi * k / n), sin(2 * pi * k / n)) for k in range(n)]
+    elif rng.random() < 0.5:
+        points = [Cartesian(rng.randint(-3, 3) / 4, rng.randint(-3, 3) / 4) for _ in range(n)]
+    else:
+        points = [Cartesian(rng.uniform(-1, 1), rng.uniform(-1, 1)) for _ in range(n)]
+
+    return PreparedPoints(Circle(Cartesian(0, 0), 1), points).angles
+
+
+def joined_windows(fi: np.ndarray, arc: float, chunks: int, align: bool, /) -> tuple:
+    n = len(fi)
+    afterlast0 = int(sweep_limits(fi, arc, [0])[0])
+    bounds = np.linspace(0, n, min(chunks, n) + 1).astype(int).tolist()
+    parts = [sweep_events(fi, arc, lo, hi, afterlast0) for lo, hi in zip(bounds, bounds[1:])]
+    first, afterlast, start = join_windows(fi, afterlast0, parts)
+    if align:
+        start = align_windows(fi, arc, first, afterlast, start, one_deg, two_deg)
+
+    return first, afterlast, start
+
+
+def assert_windows_equal(actual: tuple, expected: tuple, /):
+    for a, e in zip(actual, expected):
+        assert np.array_equal(a, e)
+
+
+@pytest.mark.parametrize('align', [False, True])
+@pytest.mark.parametrize('chunks', CHUNKS)
+def test_joined_parts(chunks, align):
+    rng = random.Random(chunks)
+    for _ in range(100):
+        # Alignment of wide arcs over exact ties is not supported by the sequential sweep either
+        fi = random_angles(rng, not align)
+        if len(fi) < 2:
+            continue
+
+        arc = rng.choice(ARCS + (rad(rng.uniform(0.5, 359)),))
+        assert_windows_equal(joined_windows(fi, arc, chunks, align), find_windows(fi, arc, align))
+
+
+@pytest.mark.parametrize('align', [False, True])
+def test_parallel_windows(align):
+    rng = random.Random('parallel')
+    for _ in range(3):
+        fi = random_angles(rng, not align)
+        arc = rng.choice(ARCS)
+        expected = find_windows(fi, arc, align)
+        for chunks in CHUNKS:
+            assert_windows_equal(parallel_windows(fi, arc, align, chunks=chunks, max_workers=2), expected)
@@ -1,4 +1,6 @@
-from typing import Generic, TypeVar, overload
+from collections.abc import Callable, Iterator, Sequence
+from itertools import chain
+from typing import Generic, Optional, TypeVar, Union, overload
 
 T = TypeVar('T')
 
@@ -26,3 +28,88 @@ class ListView(Generic[T]):
 
     def __getitem__(self, item, /):
         return self._source[item]
+
+
+class CyclicView(Generic[T]):
+    """
+    Read-only view of length consecutive items of a sequence starting at start and wrapping around its end.
+    The view takes at most two contiguous segments of the source and does not copy items.
+    Changes of items of the source are visible through the view, the length of the source must not change.
+    getitem is used to access the source, cyclic sequences pass the item access of their base type
+    """
+    __slots__ = '_getitem', '_size', '_start', '_length'
+
+    def __init__(self, source: Sequence[T], start: int, length: int, /,
+                 getitem: Optional[Callable[[Union[int, slice]], T]] = None):
+        size = len(source)
+        if not 0 <= length <= size:
+            raise ValueError(f'length of a view must be between 0 and {size}, got {length}')
+
+        if length != 0 and not 0 <= start < size:
+            raise IndexError(f'start of a view must be between 0 and {size - 1}, got {start}')
+
+        self._getitem = source.__getitem__ if getitem is None else getitem
+        self._size = size
+        self._start = start
+        self._length = length
+
+    @property
+    def segments(self, /) -> tuple[tuple[int, int], ...]:
+        """
+        Bounds of contiguous segments of the source in the order of the view
+        """
+        if self._length == 0:
+            return ()
+
+        end = self._start + self._length
+        if end <= self._size:
+            return (self._start, end),
+
+        return (self._start, self._size), (0, end - self._size)
+
+    def __len__(self, /):
+        return self._length
+
+    def __iter__(self, /) -> Iterator[T]:
+        getitem = self._getitem
+        return chain.from_iterable(map(getitem, range(a, b)) for a, b in self.segments)
+
+    def __reversed__(self, /) -> Iterator[T]:
+        getitem = self._getitem
+        return chain.from_iterable(map(getitem, range(b - 1, a - 1, -1)) for a, b in reversed(self.segments))
+
+    def __contains__(self, item: T, /):
+        return any(v is item or v == item for v in self)
+
+    @overload
+    def __getitem__(self, item: int, /) -> T: ...
+
+    @overload
+    def __getitem__(self, item: slice, /) -> list[T]: ...
+
+    def __getitem__(self, item, /):
+        if isinstance(item, slice):
+            getitem = self._getitem
+            return [getitem(self._source_index(i)) for i in range(self._length)[item]]
+
+        if not -self._length <= item < self._length:
+            raise IndexError(f'{self.__class__.__name__} index out of range')
+
+        if item < 0:
+            item += self._length
+
+        return self._getitem(self._source_index(item))
+
+    def _source_index(self, i: int, /) -> int:
+        i += self._start
+        return i - self._size if i >= self._size else i
+
+    def to_list(self, /) -> list[T]:
+        """
+        Copies items into a list segment by segment
+        """
+        getitem = self._getitem
+        return list(chain.from_iterable(getitem(slice(a, b)) for a, b in self.segments))
+
+    def __repr__(self, /):
+        return f'{self.__class__.__name__}({self.to_list()!r})'